@@ -1,7 +1,10 @@
+import copy
 import numpy
 import functools
 from handwriting_sample import HandwritingSample
+from handwriting_features.data.containers.strokes import HandwritingStrokes
 from handwriting_features.data.utils.math import derivation
+from handwriting_features.data.utils.cache import DerivedVariablesCache, cached_variable, read_only
 from handwriting_features.data.exceptions.sample import *
 
 
@@ -14,6 +17,15 @@ class HandwritingSampleWrapper(object):
     # Handwriting data surface information
     surfaces = ("on_surface", "in_air")
 
+    # Handwriting kinematic variables
+    kinematics = ("velocity", "acceleration", "jerk")
+
+    # Handwriting data channels (that can be derived)
+    channels = ("x", "y", "time", "azimuth", "tilt", "pressure")
+
+    # Size of the cache of derived variables (enough for all derived variables of a sample)
+    cache_size = 64
+
     def __init__(self, sample, source=None):
         """Constructor method"""
 
@@ -21,8 +33,15 @@ class HandwritingSampleWrapper(object):
         self.sample = sample
         self.source = source
 
-        # Set the strokes
-        self.strokes = self.sample.get_strokes()
+        # Set the strokes (stored in the columnar way, the strokes are views into the stroke data)
+        self.stroke_data = HandwritingStrokes.from_sample(self.sample)
+        self.strokes = list(self.stroke_data)
+
+        # Set the intermediate results (shared by the features computed from the sample)
+        self.intermediates = {}
+
+        # Set the cache of derived variables
+        self.variables_cache = DerivedVariablesCache(self.cache_size)
 
     def __str__(self):
         return f"{self.source}" if self.source else f"HandwritingSampleWrapper({self.sample})"
@@ -118,7 +137,7 @@ class HandwritingSampleWrapper(object):
     # Derived handwriting variables #
     # ----------------------------- #
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
+    @cached_variable
     def compute_velocity(self, axis="xy", in_air=False):
         """
         Computes the velocity.
@@ -136,12 +155,12 @@ class HandwritingSampleWrapper(object):
         self.validate_surface_movement(in_air)
 
         # Compute the velocity
-        velocity = numpy.concatenate(self._compute_strokes_velocities(axis, in_air))
+        velocity = self._compute_kinematics(axis, in_air)[0]
 
         # Return the velocity
         return velocity if velocity is not None and velocity.size > 0 else numpy.nan
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
+    @cached_variable
     def compute_acceleration(self, axis="xy", in_air=False):
         """
         Computes the acceleration.
@@ -159,12 +178,12 @@ class HandwritingSampleWrapper(object):
         self.validate_surface_movement(in_air)
 
         # Compute the acceleration
-        acceleration = numpy.concatenate(self._compute_strokes_accelerations(axis, in_air))
+        acceleration = self._compute_kinematics(axis, in_air)[1]
 
         # Return the acceleration
         return acceleration if acceleration is not None and acceleration.size > 0 else numpy.nan
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
+    @cached_variable
     def compute_jerk(self, axis="xy", in_air=False):
         """
         Computes the jerk.
@@ -182,12 +201,12 @@ class HandwritingSampleWrapper(object):
         self.validate_surface_movement(in_air)
 
         # Compute the jerk
-        jerk = numpy.concatenate(self._compute_strokes_jerks(axis, in_air))
+        jerk = self._compute_kinematics(axis, in_air)[2]
 
         # Return the jerk
         return jerk if jerk is not None and jerk.size > 0 else numpy.nan
 
-    @functools.lru_cache(maxsize=len(surfaces))
+    @cached_variable
     def compute_azimuth(self, in_air=False):
         """
         Computes the azimuth.
@@ -207,7 +226,7 @@ class HandwritingSampleWrapper(object):
         # Return the azimuth
         return data.azimuth
 
-    @functools.lru_cache(maxsize=len(surfaces))
+    @cached_variable
     def compute_tilt(self, in_air=False):
         """
         Computes the tilt.
@@ -227,7 +246,7 @@ class HandwritingSampleWrapper(object):
         # Return the tilt
         return data.tilt
 
-    @functools.lru_cache(maxsize=1)
+    @cached_variable
     def compute_pressure(self):
         """
         Computes the pressure.
@@ -237,6 +256,123 @@ class HandwritingSampleWrapper(object):
         """
         return self.on_surface_data.pressure
 
+    @cached_variable
+    def compute_strokes_increments(self, in_air=False):
+        """
+        Computes the increments of x, y and time within the strokes (all strokes at once).
+
+        The strokes are concatenated and differentiated at once, the increments crossing
+        the borders of the strokes are skipped.
+
+        :param in_air: in-air flag, defaults to False
+        :type in_air: bool, optional
+        :return: increments of x, y, time and the indices of the strokes of the increments
+        :rtype: tuple
+        """
+
+        # Validate the input arguments
+        self.validate_surface_movement(in_air)
+
+        # Gather the strokes
+        x, indices = self.stroke_data.gather("x", in_air)
+        y, _ = self.stroke_data.gather("y", in_air)
+        time, _ = self.stroke_data.gather("time", in_air)
+
+        # Take only the increments within the strokes
+        within = indices[1:] == indices[:-1]
+
+        # Return the increments
+        return derivation(x)[within], derivation(y)[within], derivation(time)[within], indices[1:][within]
+
+    # ----------------------- #
+    # Derived sample wrappers #
+    # ----------------------- #
+
+    def derive(self, **channels):
+        """
+        Derives the sample wrapper with transformed channels (copy-on-write).
+
+        The derived sample wrapper shares all data with this sample wrapper except for the
+        replaced channels, i.e. neither the sample nor its stroke data are cloned. The strokes
+        of the derived sample wrapper are views into the replaced channels.
+
+        :param channels: transformed channels (channel name -> values), e.g. x=filtered_x
+        :type channels: **kwargs
+        :return: derived sample wrapper
+        :rtype: HandwritingSampleWrapper
+        """
+
+        # Validate the input arguments
+        for channel, values in channels.items():
+            self.validate_channel(channel)
+            if len(values) != len(self.sample.time):
+                raise ValueError(
+                    f"Unsupported length of <{channel}> channel {len(values)}; must be {len(self.sample.time)}")
+
+        # Derive the sample (replace only the transformed channels)
+        sample = copy.copy(self.sample)
+        for channel, values in channels.items():
+            setattr(sample, channel, numpy.asarray(values))
+
+        # Derive the strokes (the strokes are views into the replaced channels)
+        stroke_data = self.stroke_data.derive(**channels) if channels else self.stroke_data
+        strokes = list(stroke_data) if channels else self.strokes
+
+        # Prepare the derived sample wrapper
+        wrapper = self.__class__.__new__(self.__class__)
+        wrapper.sample = sample
+        wrapper.source = self.source
+        wrapper.stroke_data = stroke_data
+        wrapper.strokes = strokes
+        wrapper.intermediates = {}
+        wrapper.variables_cache = DerivedVariablesCache(self.cache_size)
+
+        # Return the derived sample wrapper
+        return wrapper
+
+    # -------------------- #
+    # Intermediate results #
+    # -------------------- #
+
+    def get_intermediate(self, key, compute):
+        """
+        Gets the intermediate result (computed once per sample and shared by the features).
+
+        The intermediate result is a read-only view, so the features can not modify it in place.
+
+        :param key: key of the intermediate result
+        :type key: Hashable
+        :param compute: callable computing the intermediate result
+        :type compute: callable
+        :return: intermediate result
+        :rtype: Any
+        """
+        if key not in self.intermediates:
+            self.intermediates[key] = read_only(compute())
+        return self.intermediates[key]
+
+    def release_intermediate(self, name):
+        """
+        Releases the intermediate results, the cached variables and the cached data of the name.
+
+        The intermediate results and the cached variables are released for all their arguments, the cached
+        data (e.g. on_surface_data) are computed again if they are accessed later.
+
+        :param name: name of the intermediate results, e.g. ProjectionUtils for the key (ProjectionUtils, fs, n)
+        :type name: str
+        """
+
+        # Release the intermediate results
+        for key in [key for key in self.intermediates if key == name or isinstance(key, tuple) and key[0] == name]:
+            del self.intermediates[key]
+
+        # Release the cached variables
+        self.variables_cache.evict(name)
+
+        # Release the cached data
+        if isinstance(getattr(type(self), name, None), functools.cached_property):
+            self.__dict__.pop(name, None)
+
     # ---------------------------- #
     # Sample handwriting variables #
     # ---------------------------- #
@@ -295,6 +431,12 @@ class HandwritingSampleWrapper(object):
         if axis not in cls.axes:
             raise UnsupportedAxisError(f"Unsupported <axis> argument {axis}; must be in {cls.axes}")
 
+    @classmethod
+    def validate_channel(cls, channel):
+        """Validates the channel"""
+        if channel not in cls.channels:
+            raise UnsupportedChannelError(f"Unsupported <channel> argument {channel}; must be in {cls.channels}")
+
     @classmethod
     def validate_surface_movement(cls, in_air):
         """Validates the surface movement"""
@@ -305,110 +447,83 @@ class HandwritingSampleWrapper(object):
     # Computational routines #
     # ---------------------- #
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
-    def _compute_strokes_trajectories(self, axis="xy", in_air=False):
+    @cached_variable
+    def _compute_kinematics_buffer(self, in_air=False):
         """
-        Computes the strokes trajectories.
+        Computes the velocity, acceleration and jerk of the strokes on all axes (fused).
 
-        :param axis: axis to compute the trajectories from, defaults to "xy"
-        :type axis: str, optional
-        :param in_air: in-air flag, defaults to False
-        :type in_air: bool, optional
-        :return: strokes trajectories
-        :rtype: list
-        """
-
-        # Get the strokes
-        strokes = self.on_surface_strokes if not in_air else self.in_air_strokes
-
-        # Return the strokes trajectories
-        if axis == "x":
-            return [numpy.abs(derivation(stroke.x)) for stroke in strokes]
-        if axis == "y":
-            return [numpy.abs(derivation(stroke.y)) for stroke in strokes]
-        if axis == "xy":
-            return [
-                numpy.sqrt(numpy.power(derivation(stroke.x), 2) + numpy.power(derivation(stroke.y), 2))
-                for stroke in strokes
-            ]
-
-    @functools.lru_cache(maxsize=len(surfaces))
-    def _compute_strokes_time_differences(self, in_air=False):
-        """
-        Computes the strokes time differences.
+        The increments of x, y and time are computed once, and the kinematic variables of all
+        axes are written into a single preallocated structured buffer with the fields named
+        <variable>_<axis> (e.g. velocity_xy). The buffer has as many rows as the velocity,
+        the acceleration and the jerk take only the leading rows (see the returned sizes).
 
         :param in_air: in-air flag, defaults to False
         :type in_air: bool, optional
-        :return: strokes time differences
-        :rtype: list
+        :return: kinematics buffer, sizes of the velocity, acceleration and jerk
+        :rtype: tuple
+        :raises ValueError: if there are no on-surface/in-air strokes (as the stroke-by-stroke concatenation)
         """
-        return [
-            derivation(stroke.time)
-            for stroke in (self.on_surface_strokes if not in_air else self.in_air_strokes)
-        ]
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
-    def _compute_strokes_velocities(self, axis="xy", in_air=False):
-        """
-        Computes the strokes velocities.
+        # Validate the presence of the strokes
+        if not numpy.any(self.stroke_data.select(in_air)):
+            raise ValueError("need at least one array to concatenate")
 
-        :param axis: axis to compute the velocities from, defaults to "xy"
-        :type axis: str, optional
-        :param in_air: in-air flag, defaults to False
-        :type in_air: bool, optional
-        :return: strokes velocities
-        :rtype: list
-        """
+        # Get the increments within the strokes
+        dx, dy, dt, indices = self.compute_strokes_increments(in_air)
 
-        # Get the variable to differentiate over (strokes trajectories)
-        ds = self._compute_strokes_trajectories(axis, in_air)
+        # Prepare the differentiation of the velocity (within the strokes, skip the first time differences)
+        within_velocity = indices[1:] == indices[:-1]
+        indices = indices[1:][within_velocity]
+        dt_velocity = dt[1:][within_velocity]
 
-        # Get the stroke time differences
-        dt = self._compute_strokes_time_differences(in_air)
+        # Prepare the differentiation of the acceleration (within the strokes, skip the second time differences)
+        within_acceleration = indices[1:] == indices[:-1]
+        dt_acceleration = dt_velocity[1:][within_acceleration]
 
-        # Return the stokes velocities
-        return [d / t for (d, t) in zip(ds, dt)]
+        # Prepare the kinematics buffer
+        sizes = (dt.size, dt_velocity.size, dt_acceleration.size)
+        buffer = numpy.empty(dt.size, dtype=[(f"{v}_{a}", float) for v in self.kinematics for a in self.axes])
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
-    def _compute_strokes_accelerations(self, axis="xy", in_air=False):
-        """
-        Computes the strokes accelerations.
+        # Compute the kinematic variables of all axes
+        for axis in self.axes:
 
-        :param axis: axis to compute the accelerations from, defaults to "xy"
-        :type axis: str, optional
-        :param in_air: in-air flag, defaults to False
-        :type in_air: bool, optional
-        :return: strokes accelerations
-        :rtype: list
-        """
+            # Get the variable to differentiate over (strokes trajectories)
+            if axis == "x":
+                ds = numpy.abs(dx)
+            elif axis == "y":
+                ds = numpy.abs(dy)
+            else:
+                ds = numpy.sqrt(numpy.power(dx, 2) + numpy.power(dy, 2))
 
-        # Get the variable to differentiate over (strokes velocities)
-        dv = self._compute_strokes_velocities(axis, in_air)
+            # Compute the velocity, acceleration and jerk
+            velocity = buffer[f"velocity_{axis}"]
+            acceleration = buffer[f"acceleration_{axis}"][:sizes[1]]
+            jerk = buffer[f"jerk_{axis}"][:sizes[2]]
 
-        # Get the stroke time differences
-        dt = self._compute_strokes_time_differences(in_air)
+            numpy.divide(ds, dt, out=velocity)
+            numpy.divide(derivation(velocity)[within_velocity], dt_velocity, out=acceleration)
+            numpy.divide(derivation(acceleration)[within_acceleration], dt_acceleration, out=jerk)
 
-        # Return the stokes accelerations
-        return [derivation(d) / t[1:] for (d, t) in zip(dv, dt)]
+        # Return the kinematics buffer and the sizes of the variables
+        return buffer, sizes
 
-    @functools.lru_cache(maxsize=len(axes) * len(surfaces))
-    def _compute_strokes_jerks(self, axis="xy", in_air=False):
+    def _compute_kinematics(self, axis="xy", in_air=False):
         """
-        Computes the strokes jerks.
+        Computes the velocity, acceleration and jerk of the strokes (views into the kinematics buffer).
 
-        :param axis: axis to compute the jerks from, defaults to "xy"
+        The variables of the strokes are concatenated, i.e. they equal to the concatenation
+        of the variables computed stroke by stroke.
+
+        :param axis: axis to compute the kinematics from, defaults to "xy"
         :type axis: str, optional
         :param in_air: in-air flag, defaults to False
         :type in_air: bool, optional
-        :return: strokes jerks
-        :rtype: list
+        :return: velocity, acceleration and jerk
+        :rtype: tuple
         """
 
-        # Get the variable to differentiate over (strokes accelerations)
-        da = self._compute_strokes_accelerations(axis, in_air)
-
-        # Get the stroke time differences
-        dt = self._compute_strokes_time_differences(in_air)
+        # Get the kinematics buffer
+        buffer, sizes = self._compute_kinematics_buffer(in_air)
 
-        # Return the stokes jerks
-        return [derivation(d) / t[2:] for (d, t) in zip(da, dt)]
+        # Return the velocity, acceleration and jerk
+        return tuple(buffer[f"{variable}_{axis}"][:size] for variable, size in zip(self.kinematics, sizes))
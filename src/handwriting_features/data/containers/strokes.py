@@ -0,0 +1,209 @@
+import numpy
+from handwriting_sample import HandwritingSample
+
+
+class HandwritingStroke(HandwritingSample):
+    """Class implementing the handwriting stroke (a zero-copy view into the columnar strokes)"""
+
+    def __init__(self, data, start, stop):
+        """
+        Initializes the handwriting stroke object.
+
+        :param data: contiguous channels of the strokes (channel -> values)
+        :type data: dict
+        :param start: index of the first sample of the stroke
+        :type start: int
+        :param stop: index after the last sample of the stroke
+        :type stop: int
+        """
+
+        # Set the handwriting variables (slices of the contiguous channels)
+        for channel in HandwritingStrokes.channels:
+            setattr(self, channel, data[channel][start:stop])
+
+        # Set the meta data
+        self.meta = None
+
+    @property
+    def _data(self):
+        """Returns pandas DataFrame for the original data (the data of the stroke)"""
+        return self.data_pandas_dataframe
+
+
+class HandwritingStrokes(object):
+    """Class implementing the columnar (CSR-like) storage of the handwriting strokes"""
+
+    # Handwriting data channels
+    channels = ("x", "y", "time", "pen_status", "azimuth", "tilt", "pressure")
+
+    def __init__(self, data, offsets, status):
+        """
+        Initializes the handwriting strokes object.
+
+        :param data: contiguous channels of the strokes (channel -> values)
+        :type data: dict
+        :param offsets: offsets of the strokes (stroke i spans the samples offsets[i]:offsets[i + 1])
+        :type offsets: numpy.ndarray
+        :param status: on-surface status of the strokes (True: on-surface, False: in-air)
+        :type status: numpy.ndarray
+        """
+
+        # Set the contiguous channels, the offsets and the status of the strokes
+        self.data = data
+        self.offsets = offsets
+        self.status = status
+
+    def __len__(self):
+        return self.status.size
+
+    def __iter__(self):
+        """Iterates over the strokes (yields the status and the stroke, i.e. ('on_surface', HandwritingStroke))"""
+        for i, on_surface in enumerate(self.status.tolist()):
+            yield "on_surface" if on_surface else "in_air", self.get_stroke(i)
+
+    @classmethod
+    def from_sample(cls, sample):
+        """
+        Initializes HandwritingStrokes object from a sample.
+
+        The strokes are the same as the strokes of HandwritingSample.get_strokes, i.e. the samples
+        (without the last one) split at the changes of the pen status, the empty strokes are skipped.
+
+        :param sample: handwriting sample object
+        :type sample: HandwritingSample
+        :return: HandwritingStrokes object
+        :rtype: HandwritingStrokes
+        """
+
+        # Prepare the contiguous channels (of the common data type)
+        values = numpy.column_stack(sample.data_list)
+        data = {channel: numpy.ascontiguousarray(values[:, i]) for i, channel in enumerate(cls.channels)}
+
+        # Get the indices of the pen status changes (the last sample closes the last stroke)
+        pen_status = data["pen_status"]
+        changes = numpy.flatnonzero(pen_status[1:] != pen_status[:-1]) + 1
+        bounds = numpy.concatenate([[0], changes, [max(pen_status.size - 1, 0)]]).astype(numpy.int64)
+
+        # Skip the empty strokes
+        starts = bounds[:-1][numpy.diff(bounds) > 0]
+        stops = bounds[1:][numpy.diff(bounds) > 0]
+
+        # Prepare the offsets and the status of the strokes
+        offsets = numpy.append(starts, stops[-1] if stops.size else 0)
+        status = pen_status[starts] == 1
+
+        # Return the strokes
+        return cls(data, offsets, status)
+
+    @property
+    def starts(self):
+        """Returns the indices of the first samples of the strokes"""
+        return self.offsets[:-1]
+
+    @property
+    def stops(self):
+        """Returns the indices after the last samples of the strokes"""
+        return self.offsets[1:]
+
+    @property
+    def lengths(self):
+        """Returns the numbers of samples of the strokes"""
+        return numpy.diff(self.offsets)
+
+    def select(self, in_air=False):
+        """
+        Selects the on-surface/in-air strokes.
+
+        :param in_air: in-air flag, defaults to False
+        :type in_air: bool, optional
+        :return: selection of the strokes
+        :rtype: numpy.ndarray
+        """
+        return self.status != in_air
+
+    def gather(self, channel, in_air=False):
+        """
+        Gathers the channel of the on-surface/in-air strokes (concatenates the strokes).
+
+        :param channel: channel name
+        :type channel: str
+        :param in_air: in-air flag, defaults to False
+        :type in_air: bool, optional
+        :return: concatenated channel of the strokes, indices of the strokes of its samples
+        :rtype: tuple
+        """
+
+        # Get the selection of the strokes and their lengths
+        selection = self.select(in_air)
+        lengths = self.lengths
+
+        # Gather the channel
+        values = self.data[channel][:self.offsets[-1]][numpy.repeat(selection, lengths)]
+        indices = numpy.repeat(numpy.arange(numpy.count_nonzero(selection)), lengths[selection])
+
+        # Return the concatenated channel and the indices of the strokes
+        return values, indices
+
+    def reduce(self, ufunc, values, in_air=False):
+        """
+        Reduces the values of the samples per stroke, e.g. numpy.maximum yields the maxima of the strokes.
+
+        :param ufunc: reducing function
+        :type ufunc: numpy.ufunc
+        :param values: values of the samples (of the whole sample)
+        :type values: numpy.ndarray
+        :param in_air: in-air flag, defaults to False
+        :type in_air: bool, optional
+        :return: reduced values of the on-surface/in-air strokes
+        :rtype: numpy.ndarray
+        """
+        return ufunc.reduceat(values[:self.offsets[-1]], self.starts)[self.select(in_air)]
+
+    def reduce_increments(self, ufunc, increments, in_air=False):
+        """
+        Reduces the increments per stroke, e.g. numpy.add yields the sums of the increments of the strokes.
+
+        The increment i lies between the samples i and i + 1. The increments crossing the borders of the
+        strokes are replaced by the identity of the reducing function (a stroke of one sample yields it).
+
+        :param ufunc: reducing function (having the identity)
+        :type ufunc: numpy.ufunc
+        :param increments: increments of the samples (of the whole sample)
+        :type increments: numpy.ndarray
+        :param in_air: in-air flag, defaults to False
+        :type in_air: bool, optional
+        :return: reduced increments of the on-surface/in-air strokes
+        :rtype: numpy.ndarray
+        """
+
+        # Prepare the increments (replace the increments crossing the borders of the strokes)
+        increments = numpy.append(increments[:self.offsets[-1] - 1], ufunc.identity)
+        increments[self.stops - 1] = ufunc.identity
+
+        # Return the reduced increments
+        return ufunc.reduceat(increments, self.starts)[self.select(in_air)]
+
+    def get_stroke(self, i):
+        """
+        Gets the stroke.
+
+        :param i: index of the stroke
+        :type i: int
+        :return: stroke
+        :rtype: HandwritingStroke
+        """
+        return HandwritingStroke(self.data, self.offsets[i], self.offsets[i + 1])
+
+    def derive(self, **channels):
+        """
+        Derives the strokes with replaced channels (the other channels are shared).
+
+        :param channels: replaced channels (channel name -> values of the whole sample)
+        :type channels: **kwargs
+        :return: derived strokes
+        :rtype: HandwritingStrokes
+        """
+        return HandwritingStrokes(
+            {**self.data, **{channel: numpy.asarray(values) for channel, values in channels.items()}},
+            self.offsets,
+            self.status)
@@ -1,6 +1,6 @@
 import numpy
 import warnings
-from handwriting_features.data.utils.cleanup import remove_outliers
+from handwriting_features.data.utils.cleanup import rolling_median
 from handwriting_features.data.exceptions.statistics import *
 
 
@@ -181,29 +181,231 @@ def slope_of_linear_regression(array, window_size=5, min_samples=3, center=True,
     if not isinstance(array, numpy.ndarray) and not numpy.isfinite(array):
         return numpy.nan
 
-    # Create a local deepcopy of the input array
-    data = numpy.copy(array)
+    # Compute the slope (in the closed form, see: SlopeOfLinearRegression)
+    return SlopeOfLinearRegression(window_size, min_samples, center, threshold).update(array).finish()
 
-    # Remove NaN/Inf values and flatten the array
-    data = data[numpy.isfinite(data)]
-    data = data.flatten("F")
 
-    # Remove outliers
-    if data.size > window_size:
-        data = remove_outliers(data, window_size, min_samples=min_samples, center=center, threshold=threshold)
+class SlopeOfLinearRegression(object):
+    """
+    Class implementing the slope of linear regression statistic computed incrementally over chunks.
 
-    # Handle empty array
-    if data.size == 0:
-        return numpy.nan
+    The non-finite values are removed, the outliers are removed based on the rolling median (for more
+    than <window_size> values, see: remove_outliers), and the slope is computed in the closed form.
+    Only the values whose rolling median is not known yet are kept between the chunks.
 
-    # Fit the 1st order regression curve
-    try:
-        fitted = numpy.polyfit(list(range(len(data))), data, 1)
-    except numpy.linalg.LinAlgError:
-        return numpy.nan
+    The closed form keeps the running sums of the regressed values (the number of values, their mean,
+    and the sum of the products of the centered indices and values), i.e. a single chunk of the values
+    is regressed at once. The slope = sum((i - mean_i) * (y - mean_y)) / sum((i - mean_i) ** 2).
+    """
+
+    # Size of the blocks of the regressed values (the indices are shared by the blocks)
+    block_size = 65536
+
+    # Indices of the values within a block
+    indices = numpy.arange(block_size, dtype=float)
+
+    def __init__(self, window_size=5, min_samples=3, center=True, threshold=3):
+        """
+        Initializes the slope of linear regression object.
+
+        :param window_size: size of the moving window, defaults to 5
+        :type window_size: int, optional
+        :param min_samples: minimum number of samples in a window, defaults to 3
+        :type min_samples: int, optional
+        :param center: labels at the center of the window flag, defaults to True
+        :type center: bool, optional
+        :param threshold: outlier removal threshold, defaults to 3
+        :type threshold: int, optional
+        """
+
+        # Set the outlier removal arguments
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.center = center
+        self.threshold = threshold
+
+        # Set the size of the window before/after a value
+        self.after = (window_size - 1) // 2 if center else 0
+        self.before = window_size - 1 - self.after
+
+        # Set the buffered values (the values to be filtered preceded by their window)
+        self.buffer = numpy.array([])
+        self.pending = 0
+        self.count = 0
+
+        # Set the running sums of the linear regression
+        self.regressed = 0
+        self.mean = 0.0
+        self.covariance = 0.0
+
+    def update(self, chunk):
+        """
+        Updates the statistic by the chunk of the values.
+
+        :param chunk: chunk of the values
+        :type chunk: numpy.ndarray
+        :return: updated slope of linear regression object
+        :rtype: SlopeOfLinearRegression
+        """
+
+        # Remove NaN/Inf values and flatten the chunk
+        values = numpy.ravel(chunk)
+        if not numpy.isfinite(values).all():
+            values = values[numpy.isfinite(values)]
+
+        # Buffer the values
+        self.buffer = numpy.concatenate([self.buffer, values]) if self.buffer.size else values
+        self.count += values.size
+
+        # Filter the values (the outliers are removed only if there are more than <window_size> values)
+        if self.count > self.window_size:
+            self._filter(final=False)
+
+        # Return the updated statistic
+        return self
+
+    def finish(self):
+        """
+        Finishes the statistic.
+
+        :return: slope of linear regression value
+        :rtype: numpy.float
+        """
+
+        # Filter the rest of the values
+        if self.count > self.window_size:
+            self._filter(final=True)
+        else:
+            self._regress(self.buffer)
+            self.buffer = numpy.array([])
+
+        # Return the slope
+        return self.slope
+
+    @property
+    def slope(self):
+        """Returns the slope of linear regression of the regressed values (NaN for less than two values)"""
+        if self.regressed < 2:
+            return numpy.nan
+        return self.covariance / (self.regressed * (self.regressed ** 2 - 1) / 12)
+
+    def _filter(self, final):
+        """Removes the outliers of the buffered values having the complete window and adds them to the regression"""
+
+        # Get the values having the complete window (or all values for the final filtration)
+        stop = self.buffer.size if final else self.buffer.size - self.after
+        if stop <= self.pending:
+            return
+
+        # Remove the outliers
+        medians = rolling_median(self.buffer, self.window_size, min_samples=self.min_samples, center=self.center)
+        values = self.buffer[self.pending:stop]
+        values = values[numpy.abs(values) < (self.threshold * numpy.abs(medians[self.pending:stop]))]
+
+        # Update the linear regression
+        self._regress(values)
 
-    # Return the slope
-    return fitted[0]
+        # Keep only the values to be filtered preceded by their window
+        start = max(stop - self.before, 0)
+        self.buffer = self.buffer[start:]
+        self.pending = stop - start
+
+    def _regress(self, values):
+        """Updates the running sums of the linear regression by the values (following the regressed values)"""
+        for start in range(0, values.size, self.block_size):
+            self._regress_block(values[start:start + self.block_size])
+
+    def _regress_block(self, block):
+        """Updates the running sums of the linear regression by the block of the values"""
+
+        # Handle empty block
+        if not block.size:
+            return
+
+        # Get the running sums of the block
+        block_mean = numpy.mean(block)
+        block_covariance = numpy.dot(self.indices[:block.size], block - block_mean)
+
+        # Merge the running sums (the indices of the block follow the indices of the regressed values)
+        regressed = self.regressed + block.size
+        delta = block_mean - self.mean
+
+        self.covariance += block_covariance + delta * self.regressed * block.size / 2
+        self.mean += delta * block.size / regressed
+        self.regressed = regressed
+
+
+# Quantiles of the quantile-based statistics
+quantiles = {
+    "quartile_1": 0.25,
+    "quartile_3": 0.75,
+    "percentile_5": 0.05,
+    "percentile_95": 0.95
+}
+
+
+def _compute_shared_statistics(array, statistical_functions):
+    """
+    Computes the statistics of an input array sharing the work between them (see: Statistics.compute_many).
+
+    :param array: input array
+    :type array: numpy.ndarray
+    :param statistical_functions: statistical function names
+    :type statistical_functions: set
+    :return: computed statistics (statistical function name -> value)
+    :rtype: dict
+    """
+
+    # Prepare the computed statistics
+    computed = {}
+
+    # Check the presence of finite values
+    finite = numpy.isfinite(array).any()
+
+    # Compute the moment-based statistics (share the mean and std)
+    if statistical_functions & {"mean", "std", "cv_parametric"}:
+        _avg = numpy.nanmean(array) if finite else numpy.nan
+        _std = numpy.nanstd(array) if finite and statistical_functions & {"std", "cv_parametric"} else numpy.nan
+
+        computed["mean"] = _avg
+        computed["std"] = _std
+        computed["cv_parametric"] = \
+            numpy.nan \
+            if any((not numpy.isfinite(_avg), not numpy.isfinite(_std))) \
+            else _std / (_avg + numpy.finfo(float).eps)
+
+    # Compute the quantile-based statistics (share the sorted values without NaNs)
+    if statistical_functions & {"median", "iqr", "cv_nonparametric", *quantiles}:
+        data = numpy.ravel(array)
+        data = numpy.sort(data[~numpy.isnan(data)])
+
+        # Get the quantiles and the median (the mean of the middle values)
+        if data.size:
+            values = dict(zip(quantiles, numpy.quantile(data, list(quantiles.values()))))
+            _med = numpy.mean(data[(data.size - 1) // 2:data.size // 2 + 1])
+        else:
+            values = dict.fromkeys(quantiles, numpy.nan)
+            _med = numpy.nan
+
+        # Get the iqr
+        _q1, _q3 = values["quartile_1"], values["quartile_3"]
+        _iqr = numpy.nan if any((not numpy.isfinite(_q1), not numpy.isfinite(_q3))) else numpy.subtract(_q3, _q1)
+        _med = _med if finite else numpy.nan
+
+        computed.update({name: value if finite else numpy.nan for name, value in values.items()})
+        computed["median"] = _med
+        computed["iqr"] = _iqr
+        computed["cv_nonparametric"] = \
+            numpy.nan \
+            if any((not numpy.isfinite(_med), not numpy.isfinite(_iqr))) \
+            else _iqr / _med + numpy.finfo(float).eps
+
+    # Compute the slope of linear regression
+    if "slope_of_linear_regression" in statistical_functions:
+        computed["slope_of_linear_regression"] = slope_of_linear_regression(array)
+
+    # Return the computed statistics
+    return computed
 
 
 class Statistics(object):
@@ -247,3 +449,38 @@ class Statistics(object):
 
         # Compute the statistical function
         return cls.mapping[statistical_function](array)
+
+    @classmethod
+    def compute_many(cls, array, statistical_functions):
+        """
+        Computes the <statistical_functions> of an input <array> in a single pass.
+
+        The statistics share the work: the presence of finite values is checked once, the moment-based
+        statistics share the mean and std, and the quantile-based statistics share the sorted values
+        (without NaNs). The computed values are equal to the values of ``compute(...)``.
+
+        :param array: input array
+        :type array: numpy.ndarray
+        :param statistical_functions: statistical function names
+        :type statistical_functions: Any[str, list, tuple]
+        :return: computed statistics (in the order of the statistical function names)
+        :rtype: list
+        """
+
+        # Handle the statistics options
+        statistical_functions = [statistical_functions] \
+            if isinstance(statistical_functions, str) \
+            else list(statistical_functions)
+
+        # Validate input arguments
+        for statistical_function in statistical_functions:
+            if statistical_function not in cls.mapping:
+                raise StatisticsNameNotInMappingError(f"Unsupported <statistical_function> {statistical_function}")
+        if not isinstance(array, (float, numpy.ndarray)):
+            raise UnsupportedDataForStatisticsError(
+                f"Unsupported <array> type {type(array)}; "
+                f"must be any of the following: `numpy.ndarray`, `numpy.float`")
+
+        # Compute the statistical functions
+        computed = _compute_shared_statistics(array, set(statistical_functions))
+        return [computed[statistical_function] for statistical_function in statistical_functions]
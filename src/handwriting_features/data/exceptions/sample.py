@@ -6,3 +6,8 @@ class UnsupportedAxisError(Exception):
 class UnsupportedSurfaceMovementError(Exception):
     """Raised when unsupported surface movement is used"""
     pass
+
+
+class UnsupportedChannelError(Exception):
+    """Raised when unsupported channel is used"""
+    pass
@@ -0,0 +1,136 @@
+import numpy
+import inspect
+import functools
+from collections import OrderedDict
+
+
+def read_only(variable):
+    """
+    Gets a read-only view of a shared variable (of the arrays, and of the arrays in tuples, lists and dicts).
+
+    The shared variables (e.g. the intermediate results) are returned to all features, so an in-place
+    modification by one caller would silently change the results of the others. The original arrays
+    are left writeable, the containers are copied (with the read-only views of their arrays).
+
+    :param variable: shared variable
+    :type variable: Any
+    :return: read-only view of the variable
+    :rtype: Any
+    """
+    if isinstance(variable, numpy.ndarray):
+        view = variable.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(variable, tuple) and hasattr(variable, "_fields"):
+        return type(variable)(*(read_only(item) for item in variable))
+    if type(variable) in (tuple, list):
+        return type(variable)(read_only(item) for item in variable)
+    if type(variable) is dict:
+        return {key: read_only(item) for key, item in variable.items()}
+    return variable
+
+
+class DerivedVariablesCache(object):
+    """Class implementing the size-bounded (least recently used) cache of derived variables"""
+
+    def __init__(self, maxsize=64):
+        """
+        Initializes the derived variables cache object.
+
+        :param maxsize: maximum number of cached variables, defaults to 64
+        :type maxsize: int, optional
+        """
+
+        # Set the maximum number of cached variables
+        self.maxsize = maxsize
+
+        # Set the hit/miss counters
+        self.hits = 0
+        self.misses = 0
+
+        # Prepare the cached variables (key -> variable)
+        self.variables = OrderedDict()
+
+    def __len__(self):
+        return len(self.variables)
+
+    def get(self, key, compute):
+        """
+        Gets the cached variable (computes and caches the variable if it is not cached).
+
+        :param key: key of the variable
+        :type key: Hashable
+        :param compute: callable computing the variable
+        :type compute: callable
+        :return: variable
+        :rtype: Any
+        """
+
+        # Get the cached variable
+        if key in self.variables:
+            self.hits += 1
+            self.variables.move_to_end(key)
+            return self.variables[key]
+
+        # Compute the variable (a read-only view, the variable is shared)
+        self.misses += 1
+        variable = read_only(compute())
+
+        # Cache the variable (evict the least recently used variable)
+        self.variables[key] = variable
+        if len(self.variables) > self.maxsize:
+            self.variables.popitem(last=False)
+
+        # Return the variable
+        return variable
+
+    def evict(self, name):
+        """
+        Evicts the cached variables of the name (the variables keyed by the name, e.g. by the method name).
+
+        :param name: name of the variables
+        :type name: str
+        """
+        for key in [key for key in self.variables if key[0] == name]:
+            del self.variables[key]
+
+    def info(self):
+        """Returns the cache statistics (hits, misses, maxsize, size)"""
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "size": len(self.variables)}
+
+    def clear(self):
+        """Clears the cache (including the hit/miss counters)"""
+        self.variables.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def cached_variable(method):
+    """
+    Caches the variables computed by an instance method in the instance cache <variables_cache>.
+
+    The variables are keyed by the method name and by the bound arguments (including the default
+    ones), i.e. method(x) and method(axis=x) share the cached variable.
+
+    :param method: instance method computing a derived variable
+    :type method: callable
+    :return: cached instance method
+    :rtype: callable
+    """
+
+    # Get the signature of the method
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+
+        # Prepare the key of the variable
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        key = (method.__name__, ) + tuple(arguments.arguments.values())[1:]
+
+        # Return the cached variable
+        return self.variables_cache.get(key, lambda: method(self, *args, **kwargs))
+
+    # Return the cached method
+    return wrapper
@@ -1,5 +1,76 @@
 import numpy
 import pandas
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Maximum size of the moving window of the vectorized rolling median (larger windows use pandas)
+max_vectorized_window_size = 32
+
+
+def rolling_median(array, window_size, min_samples=None, center=False):
+    """
+    Computes the rolling median (ignoring NaN/Inf values), i.e. pandas.Series(array).rolling(...).median().
+
+    The small windows are sorted at once (vectorized), the large windows use the rolling median
+    of pandas (sorting them all would need window_size times the memory of the array).
+
+    :param array: input array
+    :type array: numpy.ndarray
+    :param window_size: size of the moving window
+    :type window_size: int
+    :param min_samples: minimum number of samples in a window, defaults to None (window size)
+    :type min_samples: int, optional
+    :param center: labels at the center of the window flag, defaults to False
+    :type center: bool, optional
+    :return: rolling median
+    :rtype: numpy.ndarray
+    """
+
+    # Prepare the data (Inf values are ignored as NaNs)
+    data = numpy.asarray(array, dtype=float).ravel()
+    data = numpy.where(numpy.isinf(data), numpy.nan, data)
+    min_samples = window_size if min_samples is None else min_samples
+
+    # Validate the window
+    if min_samples > window_size:
+        raise ValueError(f"min_samples {min_samples} must be <= window_size {window_size}")
+
+    # Get the offset of the window (the window of the sample i spans i + offset - window_size + 1 ... i + offset)
+    offset = (window_size - 1) // 2 if center else 0
+
+    # Handle empty array
+    if data.size == 0:
+        return numpy.array([])
+
+    # Compute the rolling median
+    if window_size <= max_vectorized_window_size:
+        return _rolling_median_vectorized(data, window_size, min_samples, offset)
+    else:
+        return pandas.Series(data).rolling(window=window_size, min_periods=min_samples, center=center).median().values
+
+
+def _rolling_median_vectorized(data, window_size, min_samples, offset):
+    """Computes the rolling median by sorting all windows at once"""
+
+    # Prepare the windows (pad the data by NaNs)
+    padded = numpy.concatenate([
+        numpy.full(window_size - 1 - offset, numpy.nan),
+        data,
+        numpy.full(offset, numpy.nan)
+    ])
+    windows = numpy.sort(sliding_window_view(padded, window_size), axis=1)
+
+    # Get the number of the samples in the windows (NaNs are sorted to the end)
+    counts = numpy.count_nonzero(~numpy.isnan(windows), axis=1)
+    rows = numpy.arange(windows.shape[0])
+
+    # Get the median (the middle value, or the mean of the middle values)
+    low = windows[rows, numpy.maximum(counts - 1, 0) // 2]
+    high = windows[rows, counts // 2 - (counts == 0)]
+    medians = numpy.where(counts % 2 == 1, low, (low + high) / 2)
+
+    # Return the rolling median (NaN for windows with too few samples)
+    return numpy.where((counts >= min_samples) & (counts > 0), medians, numpy.nan)
 
 
 def remove_outliers(array, window_size, min_samples=3, center=True, threshold=3, make_copy=False):
@@ -26,16 +97,10 @@ def remove_outliers(array, window_size, min_samples=3, center=True, threshold=3,
     data = array.copy() if make_copy else array
 
     # Apply the rolling window calculation
-    rolled = pandas.Series(data).rolling(window=window_size, min_periods=min_samples, center=center)
-
-    # Filter out outliers
-    filtered = [
-        element for element, median in zip(array, rolled.median().values)
-        if numpy.abs(element) < (threshold * numpy.abs(median))
-    ]
+    medians = rolling_median(data, window_size, min_samples=min_samples, center=center)
 
-    # Convert the filtered data into a numpy array
-    filtered = numpy.array(filtered)
+    # Filter out outliers (the samples having NaN median are filtered out as well)
+    filtered = numpy.asarray(data)[numpy.abs(data) < (threshold * numpy.abs(medians))]
 
     # Remove NaN/Inf values and flatten the array
     filtered = filtered[numpy.isfinite(filtered)]
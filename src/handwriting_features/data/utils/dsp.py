@@ -1,11 +1,60 @@
+import functools
 import scipy.signal as sc
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from handwriting_features.data.exceptions.dsp import FiltrationError
 
 
+@functools.lru_cache(maxsize=None)
+def design_filter(kind, order=None, fs=None, fc=None, n=None):
+    """
+    Designs the filter coefficients (the designs are cached, i.e. they are shared by all filters).
+
+    Supported kinds of the filters:
+
+    1. ``butter``: low-pass Butterworth filter of <order> (cutoff <fc>, sampling frequency <fs>)
+    2. ``bessel``: low-pass Bessel filter of <order> (cutoff <fc>, sampling frequency <fs>)
+    3. ``gaussian``: normalized Gaussian window of <n> samples (standard deviation <order>)
+
+    :param kind: kind of the filter
+    :type kind: str
+    :param order: order of the filter (standard deviation of the Gaussian window), defaults to None
+    :type order: int, optional
+    :param fs: sampling frequency, defaults to None
+    :type fs: float, optional
+    :param fc: cutoff frequency, defaults to None
+    :type fc: float, optional
+    :param n: number of samples of the Gaussian window, defaults to None
+    :type n: int, optional
+    :return: coefficients of the filter (numerator, denominator), read-only
+    :rtype: tuple
+    """
+
+    # Design the filter
+    if kind == "butter":
+        coefficients = sc.butter(order, LowPassFilter._get_wn(fc, fs), btype="lowpass", analog=False, output="ba")
+    elif kind == "bessel":
+        coefficients = sc.bessel(order, LowPassFilter._get_wn(fc, fs), btype="lowpass", analog=False, output="ba")
+    elif kind == "gaussian":
+        window = sc.windows.gaussian(n, std=order)
+        coefficients = (window / np.sum(window), np.array([1.0]))
+    else:
+        raise ValueError(f"Unsupported filter kind {kind}")
+
+    # Protect the shared coefficients
+    for array in coefficients:
+        array.setflags(write=False)
+
+    # Return the coefficients
+    return tuple(coefficients)
+
+
 class LowPassFilter(object):
     """Class implementing the low-pass filter"""
 
+    # Order of the low-pass filter
+    order = 10
+
     def __init__(self, fs, fc):
         self.fs = fs
         self.fc = fc
@@ -17,10 +66,10 @@ class LowPassFilter(object):
 
     @classmethod
     def _butter_lowpass_filter(cls, data, cutoff, fs, order=10):
-        """Private method performing low-pass filtering using Butterworth filter"""
+        """Private method performing low-pass filtering using Butterworth filter (along the last axis)"""
 
         # Prepare the coefficients
-        coefficients = sc.butter(order, cls._get_wn(cutoff, fs), btype="lowpass", analog=False, output="ba")
+        coefficients = design_filter("butter", order, fs, cutoff)
 
         # Filter the input signal
         try:
@@ -30,10 +79,10 @@ class LowPassFilter(object):
 
     @classmethod
     def _bessel_lowpass_filter(cls, data, cutoff, fs, order=10):
-        """Private method performing low-pass filtering using Bessel filter"""
+        """Private method performing low-pass filtering using Bessel filter (along the last axis)"""
 
         # Prepare the coefficients
-        coefficients = sc.bessel(order, cls._get_wn(cutoff, fs), btype="lowpass", analog=False, output="ba")
+        coefficients = design_filter("bessel", order, fs, cutoff)
 
         # Filter the input signal
         try:
@@ -43,53 +92,286 @@ class LowPassFilter(object):
 
     def filter(self, signal):
         """Filters an input signal by a low-pass filter"""
-        return self._butter_lowpass_filter(signal, self.fc, self.fs)
+        return self._butter_lowpass_filter(signal, self.fc, self.fs, self.order)
+
+    def filter_channels(self, signals):
+        """Filters the channels of shape (channels, samples) by a low-pass filter (in one call)"""
+        return self._butter_lowpass_filter(np.atleast_2d(signals), self.fc, self.fs, self.order)
+
+    def validate_length(self, num_samples):
+        """Validates that a signal of <num_samples> can be filtered by a low-pass filter (raises FiltrationError)"""
+
+        # Get the padding length of the forward-backward filtration
+        padlen = 3 * max(len(coefficients) for coefficients in design_filter("butter", self.order, self.fs, self.fc))
+
+        # Validate the length of the signal
+        if num_samples <= padlen:
+            raise FiltrationError(
+                f"_butter_lowpass_filter filtration failed due to The length of the input vector x "
+                f"must be greater than padlen, which is {padlen}.")
 
 
 class GaussianFilter(object):
     """Class implementing the Gaussian filter"""
 
-    def __init__(self, fs, n):
+    # Standard deviation of the Gaussian window
+    sigma = 10
+
+    # Filtration methods (None: the cheaper one is chosen for the signal and the window)
+    methods = ("direct", "fft")
+
+    # Cost model of the filtration: direct ~ n * length, fft ~ factor * log2(n) * length + overhead
+    fft_cost_factor = 30
+    fft_cost_overhead = 300000
+
+    def __init__(self, fs, n, method=None):
         self.fs = fs
         self.n = n
+        self.method = method
 
     @classmethod
-    def _custom_gaussian_filter(cls, data, n_window=50, sigma=10):
-        """Private function performing Gaussian filtration"""
+    def _custom_gaussian_filter(cls, data, n_window=50, sigma=10, method=None):
+        """Private function performing Gaussian filtration (along the last axis)"""
 
         # Prepare the Gaussian window
-        window = sc.windows.gaussian(n_window, std=sigma)
-        window = window / np.sum(window)
+        coefficients = design_filter("gaussian", sigma, n=n_window)
+
+        # Choose the filtration method
+        if method is None:
+            method = cls._choose_method(np.shape(data)[-1], n_window)
+        if method not in cls.methods:
+            raise ValueError(f"Unsupported filtration method {method}; must be in {cls.methods}")
 
         # Filter the input signal
         try:
-            return sc.filtfilt(window, 1, data)
+            if method == "fft":
+                return fft_filtfilt(coefficients[0], data)
+            return sc.filtfilt(*coefficients, data)
         except ValueError as e:
             raise FiltrationError(f"_custom_gaussian_filter filtration failed due to {e}")
 
+    @classmethod
+    def _choose_method(cls, length, n_window):
+        """Chooses the cheaper filtration method for the length of the signal and the size of the window"""
+
+        # Get the length of the padded signal
+        length = length + 6 * n_window
+
+        # Get the costs of the methods
+        direct_cost = n_window * length
+        fft_cost = cls.fft_cost_factor * np.log2(max(n_window, 2)) * length + cls.fft_cost_overhead
+
+        # Return the cheaper method
+        return "fft" if fft_cost < direct_cost else "direct"
+
     def filter(self, signal):
         """Filters an input signal by a Gaussian filter"""
-        return self._custom_gaussian_filter(signal, self.n)
+        return self._custom_gaussian_filter(signal, self.n, self.sigma, method=self.method)
+
+    def filter_channels(self, signals):
+        """Filters the channels of shape (channels, samples) by a Gaussian filter (in one call)"""
+        return self._custom_gaussian_filter(np.atleast_2d(signals), self.n, self.sigma, method=self.method)
+
+    def filter_padded(self, signals):
+        """
+        Filters the signals of different lengths (e.g. the strokes) by a Gaussian filter at once.
+
+        The signals are packed into a padded 2-D array (one signal per row) and filtered forward and
+        backward along the rows; each row equals the signal filtered alone (see: filtfilt_padded).
+
+        :param signals: input signals
+        :type signals: list
+        :return: filtered signals padded by NaNs, lengths of the signals
+        :rtype: tuple
+        """
+
+        # Get the lengths of the signals
+        lengths = np.array([len(signal) for signal in signals], dtype=int)
+
+        # Filter the signals one by one by the FFT method (it is cheaper for the longest signal)
+        if (self.method or self._choose_method(lengths.max(initial=0), self.n)) == "fft":
+            filtered = np.full((lengths.size, lengths.max(initial=0)), np.nan)
+            for row, signal in zip(filtered, signals):
+                row[:len(signal)] = self.filter(signal)
+            return filtered, lengths
+
+        # Filter the signals at once
+        try:
+            return filtfilt_padded(*design_filter("gaussian", self.sigma, n=self.n), signals), lengths
+        except ValueError as e:
+            raise FiltrationError(f"_custom_gaussian_filter filtration failed due to {e}")
+
+
+def filtfilt_padded(b, a, signals):
+    """
+    Applies the filter forward and backward to the signals of different lengths at once.
+
+    The signals are padded by their odd extensions (as scipy.signal.filtfilt does), packed into
+    a 2-D array (one signal per row) and filtered along the rows, each row starting in the steady
+    state of its own first value. Each row equals scipy.signal.filtfilt(b, a, signal).
+
+    :param b: numerator of the filter
+    :type b: numpy.ndarray
+    :param a: denominator of the filter
+    :type a: numpy.ndarray
+    :param signals: input signals
+    :type signals: list
+    :return: filtered signals padded by NaNs (of shape (number of signals, maximum length))
+    :rtype: numpy.ndarray
+    """
+
+    # Prepare the signals (concatenated) and their lengths
+    lengths = np.array([len(signal) for signal in signals], dtype=int)
+    if not lengths.size:
+        return np.empty((0, 0))
+
+    data = np.concatenate([np.asarray(signal, dtype=float) for signal in signals])
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[:, np.newaxis]
+
+    # Validate the lengths of the signals
+    padlen = 3 * max(len(a), len(b))
+    if lengths.min() <= padlen:
+        raise ValueError(f"The length of the input vector x must be greater than padlen, which is {padlen}.")
+
+    # Get the lengths of the extended signals and the positions within the extended signals
+    extended_lengths = (lengths + 2 * padlen)[:, np.newaxis]
+    positions = np.arange(extended_lengths.max())[np.newaxis, :] - padlen
+    sizes = lengths[:, np.newaxis]
+
+    # Pad the signals by their odd extensions (the values after the extended signals are irrelevant)
+    left, right = positions < 0, positions >= sizes
+    source = np.clip(np.where(left, -positions, np.where(right, 2 * (sizes - 1) - positions, positions)), 0, sizes - 1)
+    extended = data[offsets + source]
+    extended = np.where(left, 2 * data[offsets] - extended, extended)
+    extended = np.where(right, 2 * data[offsets + sizes - 1] - extended, extended)
+
+    # Filter the signals forward
+    zi = sc.lfilter_zi(b, a)[np.newaxis, :]
+    forward, _ = sc.lfilter(b, a, extended, axis=-1, zi=zi * extended[:, :1])
+
+    # Filter the signals backward (reverse each extended signal)
+    rows = np.arange(lengths.size)[:, np.newaxis]
+    reversed_forward = forward[rows, np.maximum(extended_lengths - 1 - np.arange(forward.shape[1]), 0)]
+    backward, _ = sc.lfilter(b, a, reversed_forward, axis=-1, zi=zi * reversed_forward[:, :1])
+
+    # Get the filtered signals (reverse back and remove the padding)
+    indices = np.arange(lengths.max())[np.newaxis, :]
+    filtered = backward[rows, np.maximum(extended_lengths - 1 - padlen - indices, 0)]
+
+    # Return the filtered signals (padded by NaNs)
+    return np.where(indices < sizes, filtered, np.nan)
+
+
+def fft_filtfilt(b, x, padlen=None):
+    """
+    Applies the FIR filter forward and backward (along the last axis) by the overlap-add FFT convolution.
+
+    The result is equivalent to scipy.signal.filtfilt(b, 1, x) (up to the rounding errors): the signal is
+    padded by its odd extension, and each pass starts in the steady state of its first value.
+
+    :param b: coefficients of the FIR filter
+    :type b: numpy.ndarray
+    :param x: input signal(s)
+    :type x: numpy.ndarray
+    :param padlen: number of samples to extend the signal by at both ends, defaults to None (3 * len(b))
+    :type padlen: int, optional
+    :return: filtered signal(s)
+    :rtype: numpy.ndarray
+    """
+
+    # Prepare the signal and the padding
+    x = np.asarray(x, dtype=float)
+    padlen = 3 * len(b) if padlen is None else padlen
+
+    if x.shape[-1] <= padlen:
+        raise ValueError(f"The length of the input vector x must be greater than padlen, which is {padlen}.")
+
+    # Pad the signal by its odd extension
+    extended = np.concatenate((
+        2 * x[..., :1] - x[..., padlen:0:-1],
+        x,
+        2 * x[..., -1:] - x[..., -2:-(padlen + 2):-1]), axis=-1) if padlen else x
+
+    # Filter the signal forward and backward
+    y = _fft_lfilter(b, extended)
+    y = _fft_lfilter(b, y[..., ::-1])[..., ::-1]
+
+    # Return the filtered signal (without the padding)
+    return y[..., padlen:y.shape[-1] - padlen]
+
+
+def _fft_lfilter(b, x):
+    """Applies the FIR filter (along the last axis) starting in the steady state of the first value"""
+
+    # Prepend the steady state (the first value repeated)
+    steady = np.repeat(x[..., :1], len(b) - 1, axis=-1)
+    x = np.concatenate((steady, x), axis=-1)
+
+    # Filter the signal
+    return sc.oaconvolve(x, np.reshape(b, (1, ) * (x.ndim - 1) + (-1, )), mode="valid", axes=-1)
 
 
 def segment(signal, window_size, window_step):
-    """Segments an input signal"""
+    """
+    Segments an input signal.
+
+    The windows are a strided view into the signal (no copy is made unless the last window reaches
+    the zero padding of the signal). The view is read-only.
+
+    :param signal: input signal
+    :type signal: numpy.ndarray
+    :param window_size: size of the window (even)
+    :type window_size: int
+    :param window_step: step of the window
+    :type window_step: int
+    :return: segmented signal of shape (number of windows, window size)
+    :rtype: numpy.ndarray
+    """
+    return _segment(np.asarray(signal), window_size, window_step)
+
+
+def segment_channels(signals, window_size, window_step):
+    """
+    Segments several channels (signals of the same length) in one call.
+
+    :param signals: input signals of shape (number of channels, number of samples)
+    :type signals: numpy.ndarray or list
+    :param window_size: size of the window (even)
+    :type window_size: int
+    :param window_step: step of the window
+    :type window_step: int
+    :return: segmented signals of shape (number of channels, number of windows, window size)
+    :rtype: numpy.ndarray
+    """
+    return _segment(np.atleast_2d(np.asarray(signals)), window_size, window_step)
+
+
+def _segment(signals, window_size, window_step):
+    """Segments the signals along the last axis (into the strided views)"""
 
     if window_size % 2 != 0:
         raise ValueError("Window size must be even")
 
-    # Make sure there are an even number of windows before stride is applied
-    x_padded = np.hstack((signal, np.zeros((window_size - len(signal) % window_size))))
+    # Get the length of the signals padded to make sure there are an even number of windows
+    length = signals.shape[-1]
+    padded_length = length + (window_size - length % window_size)
 
     # Get the number of windows to use
-    num_windows = (len(x_padded) - window_size) // window_step
+    num_windows = (padded_length - window_size) // window_step
+
+    # Prepare the signals (the padded samples are zeros, the signals are of the float data type at least)
+    signals = signals.astype(np.result_type(signals.dtype, np.float64), copy=False)
+
+    # Handle no windows
+    if num_windows <= 0:
+        return np.empty(signals.shape[:-1] + (0, window_size), dtype=signals.dtype)
 
-    # Prepare the segmented signal
-    segmented = np.ndarray((num_windows, window_size), dtype=x_padded.dtype)
+    # Pad the signals only if the windows reach the padding
+    if (num_windows - 1) * window_step + window_size > length:
+        signals = np.concatenate((signals, np.zeros(signals.shape[:-1] + (padded_length - length, ))), axis=-1)
 
-    # Segment the input signal
-    for i in np.arange(num_windows):
-        segmented[i] = x_padded[(i * window_step):(i * window_step + window_size)]
+    # Segment the input signals
+    segmented = sliding_window_view(signals, window_size, axis=-1)
 
-    # Return the segmented signal
-    return segmented
+    # Return the segmented signals
+    return segmented[..., :num_windows * window_step:window_step, :]
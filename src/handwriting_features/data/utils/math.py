@@ -2,6 +2,10 @@ import numpy
 import pandas
 
 
+# Maximum number of line segments of a grid cell whose pairs are enumerated at once (larger cells are tested by blocks)
+max_cell_segments = 64
+
+
 def derivation(array, order=1):
     """
     Returns a derivation of input <array>.
@@ -16,11 +20,21 @@ def derivation(array, order=1):
     return numpy.diff(array, order, axis=0) if isinstance(array, numpy.ndarray) else numpy.nan
 
 
-def intersection(x1, y1, x2=None, y2=None):
+def intersection(x1, y1, x2=None, y2=None, method=None, threshold=100, block_size=None):
     """
     Computes the intersection of two curves.
     Inspired by: https://www.mathworks.com/matlabcentral/fileexchange/22441-curve-intersections
 
+    Two computational methods are supported:
+
+    1. ``dense``: all pairs of line segments are tested at once (O(N^2) time and memory)
+    2. ``grid``: only pairs of line segments sharing a cell of a uniform grid are tested
+
+    Both methods return the same intersections. If no method is specified, the dense
+    method is used for curves having at most <threshold> samples, and the grid method
+    is used for longer curves. To bound the peak memory of both methods, the pairs of
+    line segments can be tested in blocks of at most <block_size> x <block_size> pairs.
+
     :param x1: x-values of the first curve
     :type x1: numpy.ndarray
     :param y1: y-values of the first curve
@@ -29,15 +43,127 @@ def intersection(x1, y1, x2=None, y2=None):
     :type x2: numpy.ndarray
     :param y2: y-values of the second curve
     :type y2: numpy.ndarray
+    :param method: computational method ("dense", "grid"), defaults to None
+    :type method: str, optional
+    :param threshold: number of samples above which the grid method is used, defaults to 100
+    :type threshold: int, optional
+    :param block_size: block size (number of line segments) bounding the pairs tested at once, defaults to None
+    :type block_size: int, optional
     :return: intersections
     :rtype: numpy.ndarray
     """
 
-    # Prepare the input variables
-    x1 = pandas.DataFrame(x1) if not isinstance(x1, pandas.DataFrame) else x1
-    y1 = pandas.DataFrame(y1) if not isinstance(y1, pandas.DataFrame) else y1
-    x2 = pandas.DataFrame(x2) if (x2 is not None and not isinstance(x2, pandas.DataFrame)) else x2
-    y2 = pandas.DataFrame(y2) if (y2 is not None and not isinstance(y2, pandas.DataFrame)) else y2
+    # Select the computational method (based on the length of the curves)
+    if method is None:
+        num_samples = max(len(x1), len(x2) if x2 is not None else 0)
+        method = "grid" if num_samples > threshold else "dense"
+
+    # Compute the intersections
+    if method == "dense":
+        return _intersection_dense(x1, y1, x2, y2, block_size)
+    if method == "grid":
+        return _intersection_grid(x1, y1, x2, y2, block_size)
+
+    raise ValueError(f"Unsupported <method> argument {method}; must be in ('dense', 'grid')")
+
+
+def intersection_between_curves(xs, ys, pairs=None, threshold=100, block_size=None):
+    """
+    Computes the intersections between different curves (the self-intersections are excluded).
+
+    The intersections are the same as the intersections of the concatenated curves (separated
+    by NaN) that lie on line segments of different curves, i.e. the tangent points are not taken.
+    Only the pairs of curves listed in <pairs> are tested, so the pairs of curves that can not
+    intersect (e.g. with disjoint bounding boxes) can be skipped. The line segments of the pairs
+    of curves having at most <threshold> samples are tested in blocks of <block_size> x <block_size>
+    segments, longer curves are tested by the grid method (in chunks of at most <block_size>^2 pairs).
+
+    :param xs: x-values of the curves
+    :type xs: list
+    :param ys: y-values of the curves
+    :type ys: list
+    :param pairs: pairs of indices of the curves (a < b), defaults to None (all pairs)
+    :type pairs: list, optional
+    :param threshold: number of samples above which the grid method is used, defaults to 100
+    :type threshold: int, optional
+    :param block_size: block size (number of line segments) bounding the pairs tested at once, defaults to None
+    :type block_size: int, optional
+    :return: intersections
+    :rtype: numpy.ndarray
+    """
+
+    # Prepare the curves
+    xs = [_as_vector(x) for x in xs]
+    ys = [_as_vector(y) for y in ys]
+
+    # Prepare the pairs of curves
+    if pairs is None:
+        pairs = [(a, b) for a in range(len(xs)) for b in range(a + 1, len(xs))]
+
+    # Concatenate the curves (separated by NaN)
+    separator = numpy.array([numpy.nan])
+    x = numpy.concatenate([numpy.concatenate([curve, separator]) for curve in xs] or [separator])
+    y = numpy.concatenate([numpy.concatenate([curve, separator]) for curve in ys] or [separator])
+
+    # Get the offsets of the curves in the concatenated curve
+    offsets = numpy.cumsum([0] + [curve.size + 1 for curve in xs])
+
+    # Compute the terms of the line segments
+    terms = _get_segment_terms(x, y)
+
+    # Collect row and column indices of line segments where intersections are expected
+    i = []
+    j = []
+
+    for a, b in pairs:
+
+        # Prepare the line segments of both curves
+        rows = slice(offsets[a], offsets[a] + max(xs[a].size - 1, 0))
+        cols = slice(offsets[b], offsets[b] + max(xs[b].size - 1, 0))
+
+        # Collect the indices (the long curves are tested by the grid method)
+        if max(xs[a].size, xs[b].size) > threshold:
+            i_pair, j_pair = _get_candidate_segment_pairs(xs[a], ys[a], xs[b], ys[b], True, block_size)
+            i.append(i_pair + rows.start)
+            j.append(j_pair + cols.start)
+            continue
+
+        size = block_size if block_size else max(rows.stop - rows.start, cols.stop - cols.start, 1)
+
+        for i_start in range(rows.start, rows.stop, size):
+            for j_start in range(cols.start, cols.stop, size):
+                i_block, j_block = _get_block_segment_pairs(
+                    x, y, terms, x, y, terms,
+                    slice(i_start, min(i_start + size, rows.stop)),
+                    slice(j_start, min(j_start + size, cols.stop)),
+                    tangent=False)
+                i.append(i_block)
+                j.append(j_block)
+
+    # Merge the pairs of line segments (take only the pairs i < j, sort them in the row-major order)
+    i = numpy.concatenate(i) if i else numpy.array([], dtype=numpy.int64)
+    j = numpy.concatenate(j) if j else numpy.array([], dtype=numpy.int64)
+
+    i, j = numpy.minimum(i, j), numpy.maximum(i, j)
+    order = numpy.lexsort((j, i))
+    i = i[order]
+    j = j[order]
+
+    # Solve the pairs of line segments
+    intersections = _solve_segment_pairs(x, y, x, y, i, j, tangent=False)
+
+    # Return the intersections
+    return intersections if isinstance(intersections, numpy.ndarray) else numpy.empty((0, 2))
+
+
+def _intersection_dense(x1, y1, x2=None, y2=None, block_size=None):
+    """
+    Computes the intersection of two curves by testing all pairs of line segments.
+
+    The pairs are tested in blocks of <block_size> x <block_size> line segments, so the
+    peak memory is bounded by block_size^2 instead of N^2. If <block_size> is None, all
+    pairs are tested in a single block.
+    """
 
     # Prepare the handling of the intersections (based on the presence of the second curve)
     #
@@ -45,116 +171,359 @@ def intersection(x1, y1, x2=None, y2=None):
     # 2. if the second curve is provided, all intersection points will be returned
     second_curve_exists = False if x2 is None else True
 
-    # Handle the presence of the second curve
-    if not second_curve_exists:
-        x2 = x1
-        y2 = y1
-        x2 = numpy.mat(x2.values).transpose()
-        y2 = numpy.mat(y2.values).transpose()
-    else:
-        x2 = numpy.mat(x2.values).transpose()
-        y2 = numpy.mat(y2.values).transpose()
+    # Prepare the input variables
+    x1 = _as_vector(x1)
+    y1 = _as_vector(y1)
+    x2 = _as_vector(x2) if second_curve_exists else x1
+    y2 = _as_vector(y2) if second_curve_exists else y1
 
-    # Convert the 1st curve to column-vectors
-    x1 = numpy.mat(x1.values)
-    y1 = numpy.mat(y1.values)
+    # Get the number of line segments and the block size
+    num_segments_1 = max(x1.size - 1, 0)
+    num_segments_2 = max(x2.size - 1, 0)
+    block_size = block_size if block_size else max(num_segments_1, num_segments_2, 1)
 
-    # Combine x and y for each curve to one master matrix
-    #
-    # 1. the 1st curve - column vector
-    # 2. the 2nd curve - row vector
-    curve1 = numpy.hstack([x1, y1])
-    curve2 = numpy.vstack([x2, y2])
+    # Compute the terms of the line segments
+    terms_1 = _get_segment_terms(x1, y1)
+    terms_2 = _get_segment_terms(x2, y2)
+
+    # Collect row and column indices of line segments where intersections are expected
+    i = []
+    j = []
+
+    for i_start in range(0, num_segments_1, block_size):
+        for j_start in range(0, num_segments_2, block_size):
 
-    x1 = curve1.transpose()[0].transpose()
-    y1 = curve1.transpose()[1].transpose()
-    x2 = curve2[0]
-    y2 = curve2[1]
+            # Self-intersections are symmetric: test only the blocks on and above the diagonal
+            if not second_curve_exists and j_start + block_size <= i_start:
+                continue
+
+            # Prepare the blocks of line segments
+            rows = slice(i_start, min(i_start + block_size, num_segments_1))
+            cols = slice(j_start, min(j_start + block_size, num_segments_2))
+
+            # Collect the indices (take only the pairs i < j for the self-intersections)
+            i_block, j_block = _get_block_segment_pairs(
+                x1, y1, terms_1, x2, y2, terms_2, rows, cols, tangent=second_curve_exists)
+
+            if not second_curve_exists:
+                i_block, j_block = i_block[i_block < j_block], j_block[i_block < j_block]
+
+            i.append(i_block)
+            j.append(j_block)
+
+    # Merge the blocks (sort the indices in the row-major order)
+    i = numpy.concatenate(i) if i else numpy.array([], dtype=numpy.int64)
+    j = numpy.concatenate(j) if j else numpy.array([], dtype=numpy.int64)
+
+    order = numpy.lexsort((j, i))
+    i = i[order]
+    j = j[order]
+
+    # Solve the pairs of line segments
+    return _solve_segment_pairs(x1, y1, x2, y2, i, j, second_curve_exists)
+
+
+def _intersection_grid(x1, y1, x2=None, y2=None, block_size=None):
+    """
+    Computes the intersection of two curves by testing pairs of line segments sharing a grid cell.
+
+    The pairs of line segments are tested in chunks of at most <block_size> x <block_size> pairs,
+    so the peak memory is bounded by block_size^2. If <block_size> is None, the pairs of the grid
+    cells are tested at once (the cells holding many line segments are still tested by blocks).
+    """
+
+    # Prepare the handling of the intersections (based on the presence of the second curve)
+    second_curve_exists = False if x2 is None else True
+
+    # Prepare the input variables
+    x1 = _as_vector(x1)
+    y1 = _as_vector(y1)
+    x2 = _as_vector(x2) if second_curve_exists else x1
+    y2 = _as_vector(y2) if second_curve_exists else y1
+
+    # Get the candidate pairs of line segments
+    i, j = _get_candidate_segment_pairs(x1, y1, x2, y2, second_curve_exists, block_size)
+
+    # Solve the candidate pairs of line segments
+    return _solve_segment_pairs(x1, y1, x2, y2, i, j, second_curve_exists)
+
+
+def _as_vector(values):
+    """Converts the input values to a flat vector of floats"""
+    return numpy.asarray(values.values if isinstance(values, pandas.DataFrame) else values, dtype=float).ravel()
+
+
+def _no_intersections():
+    """Returns the representation of no intersections"""
+    return pandas.DataFrame({"xs": [None], "xy": [None]}, columns=["xs", "ys"])
+
+
+def _get_segment_boxes(x, y):
+    """Gets the bounding boxes of the line segments of a curve"""
+    return (
+        numpy.minimum(x[:-1], x[1:]),
+        numpy.maximum(x[:-1], x[1:]),
+        numpy.minimum(y[:-1], y[1:]),
+        numpy.maximum(y[:-1], y[1:])
+    )
+
+
+def _get_segment_terms(x, y):
+    """Gets the distances between adjacent x's and y's, and the signed differences of the line segments"""
 
     # Compute the distance between adjacent x's and y's
-    dx1 = numpy.diff(x1, axis=0)
-    dx2 = numpy.diff(x2)
-    dy1 = numpy.diff(y1, axis=0)
-    dy2 = numpy.diff(y2)
+    dx = numpy.diff(x)
+    dy = numpy.diff(y)
 
     # Compute the signed differences
-    s1 = numpy.multiply(dx1, y1[0:len(y1) - 1]) - numpy.multiply(dy1, x1[0:len(x1) - 1])
-    s2 = \
-        numpy.multiply(dx2, y2.transpose()[0:len(y2.transpose()) - 1].transpose()) - \
-        numpy.multiply(dy2, x2.transpose()[0:len(x2.transpose()) - 1].transpose())
+    s = numpy.multiply(dx, y[:-1]) - numpy.multiply(dy, x[:-1])
 
-    f1 = dx1 * y2 - dy1 * x2
-    f2 = y1 * dx2 - x1 * dy2
+    # Return the terms
+    return dx, dy, s
 
-    f2t = f2.transpose()
-    s2t = s2.transpose()
+
+def _get_block_segment_pairs(x1, y1, terms_1, x2, y2, terms_2, rows, cols, tangent):
+    """
+    Gets the pairs of line segments of a block (<rows> of the first curve, <cols> of the second
+    curve) where intersections are expected. If <tangent> is True, the tangent points are taken.
+    """
+
+    # Prepare the terms of the line segments
+    dx1, dy1, s1 = terms_1
+    dx2, dy2, s2 = terms_2
+
+    rows_ext = slice(rows.start, rows.stop + 1)
+    cols_ext = slice(cols.start, cols.stop + 1)
 
     # Collected distances between points in one curve and line segments in the other
-    c1 = numpy.multiply(
-        f1[0:int(f1.shape[0]), 0:int(f1.shape[1]) - 1] - s1,
-        f1[0:int(f1.shape[0]), 1:int(f1.shape[1])] - s1)
-    c2 = numpy.multiply(
-        f2t[0:int(f2t.shape[0]), 0:int(f2t.shape[1]) - 1] - s2t,
-        f2t[0:int(f2t.shape[0]), 1:int(f2t.shape[1])] - s2t)
-
-    # If looking for self-intersections, take only points that aren't tangential
-    if not second_curve_exists:
-        tf1 = c1 < 0
-        tf2 = c2 < 0
-
-    # Otherwise, take tangent points as well
+    f1 = dx1[rows, None] * y2[None, cols_ext] - dy1[rows, None] * x2[None, cols_ext]
+    f2 = y1[rows_ext, None] * dx2[None, cols] - x1[rows_ext, None] * dy2[None, cols]
+
+    c1 = (f1[:, :-1] - s1[rows, None]) * (f1[:, 1:] - s1[rows, None])
+    c2 = (f2[:-1, :] - s2[None, cols]) * (f2[1:, :] - s2[None, cols])
+
+    # Take the points that aren't tangential (or the tangential points as well)
+    keep = ((c1 <= 0) & (c2 <= 0)) if tangent else ((c1 < 0) & (c2 < 0))
+
+    # Return the indices
+    i, j = numpy.nonzero(keep)
+    return i + rows.start, j + cols.start
+
+
+def _get_candidate_segment_pairs(x1, y1, x2, y2, second_curve_exists, block_size=None):
+    """
+    Gets the pairs of line segments whose bounding boxes share a cell of a uniform grid.
+
+    The pairs are returned as sorted (unique) indices of the line segments of the first
+    and of the second curve. If there is no second curve, only pairs i < j are returned
+    (the line segments are tested symmetrically). The zero-length line segments are skipped
+    (they can not intersect), the pairs are tested in chunks of at most <block_size>^2 pairs,
+    and the cells holding more than <max_cell_segments> line segments (e.g. the coincident
+    line segments) are tested block by block, so neither the time nor the memory blows up.
+    Only the pairs passing the intersection test of _solve_segment_pairs are returned.
+    """
+
+    # Prepare the bounding boxes of the line segments of both curves
+    boxes_1 = _get_segment_boxes(x1, y1)
+    boxes_2 = _get_segment_boxes(x2, y2) if second_curve_exists else tuple(b[:0] for b in boxes_1)
+
+    # Concatenate the line segments (the segments of the second curve follow the first curve)
+    num_segments_1 = boxes_1[0].size
+    num_segments_2 = boxes_2[0].size if second_curve_exists else num_segments_1
+    x_min, x_max, y_min, y_max = (numpy.concatenate([b1, b2]) for b1, b2 in zip(boxes_1, boxes_2))
+
+    # Take only the line segments with finite end points (NaN separates the curve pieces) and non-zero length
+    segments = numpy.flatnonzero(numpy.isfinite(x_min + x_max + y_min + y_max) & ((x_min < x_max) | (y_min < y_max)))
+    empty = numpy.array([], dtype=numpy.int64)
+
+    if segments.size < 2:
+        return empty, empty
+
+    x_min, x_max, y_min, y_max = x_min[segments], x_max[segments], y_min[segments], y_max[segments]
+
+    # Prepare the cell size of the grid (approx. one segment per cell, at least the mean segment size)
+    width = x_max.max() - x_min.min()
+    height = y_max.max() - y_min.min()
+    cell = max(
+        numpy.sqrt(width * height / segments.size),
+        numpy.mean(numpy.maximum(x_max - x_min, y_max - y_min)))
+    cell = cell if cell > 0 else 1.
+
+    # Compute the ranges of cells covered by the bounding boxes (coarsen the grid for very long segments)
+    while True:
+        cx_min = numpy.floor((x_min - x_min.min()) / cell).astype(numpy.int64)
+        cx_max = numpy.floor((x_max - x_min.min()) / cell).astype(numpy.int64)
+        cy_min = numpy.floor((y_min - y_min.min()) / cell).astype(numpy.int64)
+        cy_max = numpy.floor((y_max - y_min.min()) / cell).astype(numpy.int64)
+
+        span_x = cx_max - cx_min + 1
+        span_y = cy_max - cy_min + 1
+        counts = span_x * span_y
+
+        if counts.sum() <= 8 * segments.size:
+            break
+        cell *= 2
+
+    # Enumerate the cells covered by each line segment
+    owner = numpy.repeat(numpy.arange(segments.size), counts)
+    offset = numpy.arange(owner.size) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+
+    cells = (cx_min[owner] + offset // span_y[owner]) * (cy_max.max() + 1) + (cy_min[owner] + offset % span_y[owner])
+
+    # Group the line segments by cells
+    order = numpy.argsort(cells, kind="stable")
+    cells = cells[order]
+    owner = owner[order]
+
+    # Get the end points of the line segments (to test the pairs)
+    points = _get_segment_points(x1, y1, x2, y2, second_curve_exists, segments)
+
+    # Get the sizes of the cells (the large cells are tested block by block)
+    group_start = numpy.searchsorted(cells, cells, side="left")
+    group_end = numpy.searchsorted(cells, cells, side="right")
+    max_cell_size = min(max_cell_segments, block_size) if block_size else max_cell_segments
+    large = (group_end - group_start) > max_cell_size
+
+    # Collect the pairs of line segments sharing a small cell (in chunks of at most <block_size>^2 pairs)
+    partners = numpy.where(large, 0, group_end - numpy.arange(cells.size) - 1)
+    total = numpy.cumsum(partners)
+    limit = block_size ** 2 if block_size else max(int(total[-1]), 1)
+
+    a, b = [], []
+    start = 0
+
+    while start < cells.size:
+        stop = max(int(numpy.searchsorted(total, (total[start] - partners[start]) + limit, side="right")), start + 1)
+        chunk = partners[start:stop]
+
+        left = numpy.repeat(numpy.arange(start, stop), chunk)
+        right = left + 1 + numpy.arange(left.size) - numpy.repeat(numpy.cumsum(chunk) - chunk, chunk)
+
+        a_chunk, b_chunk = _test_segment_pairs(points, owner[left], owner[right])
+        a.append(a_chunk)
+        b.append(b_chunk)
+        start = stop
+
+    # Collect the pairs of line segments sharing a large cell (block by block)
+    size = block_size if block_size else max_cell_segments * 4
+
+    for cell_start in numpy.unique(group_start[large]):
+        members = owner[cell_start:group_end[cell_start]]
+
+        for i_start in range(0, members.size, size):
+            for j_start in range(i_start, members.size, size):
+                rows = numpy.arange(i_start, min(i_start + size, members.size))
+                cols = numpy.arange(j_start, min(j_start + size, members.size))
+
+                left, right = numpy.nonzero(rows[:, None] < cols[None, :])
+                a_chunk, b_chunk = _test_segment_pairs(points, members[rows[left]], members[cols[right]])
+                a.append(a_chunk)
+                b.append(b_chunk)
+
+    a = segments[numpy.concatenate(a)]
+    b = segments[numpy.concatenate(b)]
+
+    # Prepare the indices of the line segments (the first curve, the second curve)
+    if second_curve_exists:
+        i = numpy.minimum(a, b)
+        j = numpy.maximum(a, b) - num_segments_1
+        selection = (i < num_segments_1) & (j >= 0)
+        i, j = i[selection], j[selection]
     else:
-        tf1 = c1 <= 0
-        tf2 = c2 <= 0
+        i = numpy.minimum(a, b)
+        j = numpy.maximum(a, b)
+        selection = i != j
+        i, j = i[selection], j[selection]
 
-    tf2 = tf2.transpose()
+    # Get the unique pairs (sorted in the row-major order)
+    keys = numpy.unique(i * num_segments_2 + j)
 
-    # Keep indicates row and column indices of line segments where intersections between the two curves are expected
-    keep = tf1 & tf2
+    # Return the pairs
+    return keys // num_segments_2, keys % num_segments_2
 
-    # Collect row and column index values from the keep matrix
-    i = []
-    j = []
-    for row in range(keep.shape[0]):
-        for column in range(keep.shape[1]):
-            if keep[row, column]:
-                i.append(row)
-                j.append(column)
-
-    if not i:
-        return pandas.DataFrame({"xs": [None], "xy": [None]}, columns=["xs", "ys"])
-
-    # Transpose the distances
-    dy2 = dy2.transpose()
-    dx2 = dx2.transpose()
-
-    # Prepare the computation
-    r = numpy.multiply(dy2[j], dx1[i]) - numpy.multiply(dy1[i], dx2[j])
-
-    r_prime = []
-    i_prime = []
-    j_prime = []
-
-    for num in range(r.shape[0]):
-        if r[num] != 0:
-            r_prime.append(r[num, 0])
-            i_prime.append(i[num])
-            j_prime.append(j[num])
-
-    r_prime = numpy.mat(r_prime).transpose()
-
-    # Set up numerator and denominator to solve the system of equations
-    numerator = numpy.hstack([
-        numpy.multiply(dx2[j_prime], s1[i_prime]) - numpy.multiply(dx1[i_prime], s2t[j_prime]),
-        numpy.multiply(dy2[j_prime], s1[i_prime]) - numpy.multiply(dy1[i_prime], s2t[j_prime])
-    ])
-    denominator = numpy.hstack([
-        r_prime,
-        r_prime
-    ])
+
+def _get_segment_points(x1, y1, x2, y2, second_curve_exists, segments):
+    """Gets the end points of the selected line segments of the concatenated curves (x0, y0, x1, y1)"""
+
+    # Concatenate the line segments (the segments of the second curve follow the first curve)
+    x_start = numpy.concatenate([x1[:-1], x2[:-1]]) if second_curve_exists else x1[:-1]
+    y_start = numpy.concatenate([y1[:-1], y2[:-1]]) if second_curve_exists else y1[:-1]
+    x_stop = numpy.concatenate([x1[1:], x2[1:]]) if second_curve_exists else x1[1:]
+    y_stop = numpy.concatenate([y1[1:], y2[1:]]) if second_curve_exists else y1[1:]
+
+    # Return the end points of the selected line segments
+    return x_start[segments], y_start[segments], x_stop[segments], y_stop[segments]
+
+
+def _test_segment_pairs(points, a, b):
+    """
+    Tests the pairs of line segments <a>, <b> (indices into <points>) and returns the pairs that can intersect.
+
+    The test is the test of _solve_segment_pairs including the tangent points (the same terms are computed
+    in the same way), so no intersection is lost, and the parallel line segments are skipped.
+    """
+
+    # Prepare the end points and the terms of the line segments
+    x0, y0, x1, y1 = points
+
+    dxa, dya = x1[a] - x0[a], y1[a] - y0[a]
+    dxb, dyb = x1[b] - x0[b], y1[b] - y0[b]
+    sa = dxa * y0[a] - dya * x0[a]
+    sb = dxb * y0[b] - dyb * x0[b]
+
+    # Collected distances between points of one line segment and the other line segment
+    c1 = (dxa * y0[b] - dya * x0[b] - sa) * (dxa * y1[b] - dya * x1[b] - sa)
+    c2 = (y0[a] * dxb - x0[a] * dyb - sb) * (y1[a] * dxb - x1[a] * dyb - sb)
+
+    # Take the pairs that can intersect (non-parallel line segments)
+    keep = (c1 <= 0) & (c2 <= 0) & ((dyb * dxa - dya * dxb) != 0)
+
+    # Return the pairs
+    return a[keep], b[keep]
+
+
+def _solve_segment_pairs(x1, y1, x2, y2, i, j, tangent):
+    """
+    Solves the pairs of line segments <i> (the first curve) and <j> (the second curve).
+
+    The pairs must be sorted in the row-major order. If there is no second curve, the pairs
+    must satisfy i < j (the symmetric pairs yield the same intersections). If <tangent> is
+    True, the tangent points are taken as well.
+    """
+
+    # Compute the terms of the line segments
+    dx1, dy1, s1 = _get_segment_terms(x1, y1)
+    dx2, dy2, s2 = _get_segment_terms(x2, y2)
+
+    # Collected distances between points in one curve and line segments in the other
+    c1 = \
+        (dx1[i] * y2[j] - dy1[i] * x2[j] - s1[i]) * \
+        (dx1[i] * y2[j + 1] - dy1[i] * x2[j + 1] - s1[i])
+    c2 = \
+        (y1[i] * dx2[j] - x1[i] * dy2[j] - s2[j]) * \
+        (y1[i + 1] * dx2[j] - x1[i + 1] * dy2[j] - s2[j])
+
+    # If looking for self-intersections, take only points that aren't tangential, otherwise take them as well
+    keep = ((c1 <= 0) & (c2 <= 0)) if tangent else ((c1 < 0) & (c2 < 0))
+
+    if not keep.any():
+        return _no_intersections()
+
+    i = i[keep]
+    j = j[keep]
+
+    # Prepare the computation (take only non-parallel line segments)
+    r = dy2[j] * dx1[i] - dy1[i] * dx2[j]
+
+    i = i[r != 0]
+    j = j[r != 0]
+    r = r[r != 0]
 
     # Solve the system of equations
-    result = numpy.divide(numerator, denominator)
+    result = numpy.column_stack([
+        (dx2[j] * s1[i] - dx1[i] * s2[j]) / r,
+        (dy2[j] * s1[i] - dy1[i] * s2[j]) / r
+    ])
 
     # Organize the intersections into pandas DataFrame
     intersections = pandas.DataFrame(result, columns=["xs", "ys"])
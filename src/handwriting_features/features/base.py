@@ -189,12 +189,14 @@ class HandwritingFeaturesBase(object):
         # Handle the statistics options
         statistics = [statistics] if isinstance(statistics, str) else statistics
 
-        # Compute the statistics
+        # Compute the statistics (in a single pass)
         if statistics:
-            feature = numpy.array([Statistics.compute(feature, stat) for stat in statistics])
+            feature = numpy.array(Statistics.compute_many(feature, statistics))
         else:
             if not isinstance(feature, numpy.ndarray):
                 feature = numpy.array(feature).reshape((1,))
+            elif not feature.flags.writeable:
+                feature = feature.copy()
 
         # Return the feature
         return feature
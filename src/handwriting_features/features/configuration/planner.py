@@ -0,0 +1,72 @@
+from handwriting_features.features.configuration.settings import HandwritingFeaturesSettings
+
+
+class HandwritingFeaturesPlanner(object):
+    """Class implementing the planner of the features computation (shares and releases the intermediates)"""
+
+    # Handwriting features settings
+    features_settings = HandwritingFeaturesSettings
+
+    @classmethod
+    def plan(cls, feature_names):
+        """
+        Plans the computation of the features.
+
+        The features are ordered topologically by the dependency graph of the intermediates: the features
+        sharing the intermediates are computed one after another (in the order of the first of them in the
+        pipeline), the features computed from fewer intermediates are computed first. Each intermediate is
+        computed once (by its first consumer) and released right after its last consumer.
+
+        :param feature_names: names of the features (in the order of the pipeline)
+        :type feature_names: list
+        :return: order of the computation (indices of the features), intermediates to release after each step
+        :rtype: tuple
+        """
+
+        # Get the intermediates of the features
+        intermediates = [cls.features_settings.get_feature_intermediates(name) for name in feature_names]
+
+        # Get the topological order of the intermediates (by the first consumer in the pipeline)
+        ranks = {}
+        for feature in intermediates:
+            for intermediate in feature:
+                ranks.setdefault(intermediate, len(ranks))
+
+        # Prepare the order of the computation
+        order = []
+        scheduled = set()
+
+        # Schedule the features (each feature together with the features sharing its intermediates)
+        for index in range(len(feature_names)):
+            if index in scheduled:
+                continue
+
+            # Get the group of the features sharing the intermediates (transitively)
+            group, shared = {index}, set(intermediates[index])
+            while True:
+                sharing = {
+                    i for i in range(len(feature_names))
+                    if i not in group and i not in scheduled and shared.intersection(intermediates[i])
+                }
+                if not sharing:
+                    break
+                group.update(sharing)
+                shared.update(*(intermediates[i] for i in sharing))
+
+            # Schedule the group (the features computed from fewer/earlier intermediates first)
+            group = sorted(group, key=lambda i: (max((ranks[x] for x in intermediates[i]), default=-1), i))
+            order.extend(group)
+            scheduled.update(group)
+
+        # Prepare the intermediates to release after each step (after the last consumer)
+        last_consumers = {}
+        for step, index in enumerate(order):
+            for intermediate in intermediates[index]:
+                last_consumers[intermediate] = step
+
+        releases = [[] for _ in order]
+        for intermediate, step in sorted(last_consumers.items(), key=lambda item: -ranks[item[0]]):
+            releases[step].append(intermediate)
+
+        # Return the order and the releases
+        return tuple(order), tuple(tuple(release) for release in releases)
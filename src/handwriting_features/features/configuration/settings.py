@@ -266,6 +266,11 @@ class HandwritingFeaturesSettings(object):
                 "is_multi_valued": True
             },
             "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                },
                 "statistics": {
                     "mandatory": False,
                     "type": [str, list, tuple],
@@ -280,6 +285,11 @@ class HandwritingFeaturesSettings(object):
                 "is_multi_valued": True
             },
             "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                },
                 "statistics": {
                     "mandatory": False,
                     "type": [str, list, tuple],
@@ -293,7 +303,13 @@ class HandwritingFeaturesSettings(object):
             "properties": {
                 "is_multi_valued": False
             },
-            "arguments": {}
+            "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                }
+            }
         },
 
         # Relative total number of intra-stroke intersections
@@ -301,7 +317,13 @@ class HandwritingFeaturesSettings(object):
             "properties": {
                 "is_multi_valued": False
             },
-            "arguments": {}
+            "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                }
+            }
         },
 
         # Number of inter-stroke intersections
@@ -309,7 +331,13 @@ class HandwritingFeaturesSettings(object):
             "properties": {
                 "is_multi_valued": False
             },
-            "arguments": {}
+            "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                }
+            }
         },
 
         # Relative number of inter-stroke intersections
@@ -317,7 +345,13 @@ class HandwritingFeaturesSettings(object):
             "properties": {
                 "is_multi_valued": False
             },
-            "arguments": {}
+            "arguments": {
+                "block_size": {
+                    "mandatory": False,
+                    "type": [int],
+                    "default": 0
+                }
+            }
         },
 
         # Vertical peaks indices
@@ -773,6 +807,104 @@ class HandwritingFeaturesSettings(object):
         }
     }
 
+    # Handwriting features intermediates (intermediate: intermediates it is computed from)
+    #
+    # The intermediates are named by the keys they are shared by in the sample wrapper, i.e. by the keys
+    # of the intermediate results (see: HandwritingSampleWrapper.get_intermediate), by the names of the
+    # methods computing the cached variables (see: cached_variable) or by the names of the cached data
+    # of the sample wrapper (e.g. HandwritingSampleWrapper.on_surface_data). The keys of all of them
+    # are declared here (see: tests/test_planner.py), so the planner never releases an intermediate
+    # before its last consumer.
+    intermediates = {
+
+        # Sample data
+        "on_surface_data": (),
+        "in_air_data": (),
+        "on_surface_strokes": (),
+        "in_air_strokes": (),
+
+        # Kinematics
+        "compute_strokes_increments": (),
+        "_compute_kinematics_buffer": ("compute_strokes_increments", ),
+        "compute_velocity": ("_compute_kinematics_buffer", ),
+        "compute_acceleration": ("_compute_kinematics_buffer", ),
+        "compute_jerk": ("_compute_kinematics_buffer", ),
+
+        # Dynamics
+        "compute_azimuth": ("on_surface_data", "in_air_data"),
+        "compute_tilt": ("on_surface_data", "in_air_data"),
+        "compute_pressure": ("on_surface_data", ),
+
+        # Strokes
+        "stroke_lengths": ("on_surface_strokes", "in_air_strokes"),
+        "stroke_durations": ("on_surface_strokes", "in_air_strokes"),
+
+        # Intersections, projections and filtered signals
+        "IntersectionUtils": ("on_surface_strokes", ),
+        "ProjectionUtils": ("on_surface_data", ),
+        "FilteredSignalBank": ("on_surface_strokes", )
+    }
+
+    # Handwriting features dependencies (feature: intermediates it is computed from)
+    dependencies = {
+
+        # 1. Kinematic features
+        "velocity": ("compute_velocity", ),
+        "acceleration": ("compute_acceleration", ),
+        "jerk": ("compute_jerk", ),
+
+        # 2. Dynamic features
+        "azimuth": ("compute_azimuth", ),
+        "tilt": ("compute_tilt", ),
+        "pressure": ("compute_pressure", ),
+
+        # 3. Spatial features
+        "stroke_length": ("stroke_lengths", ),
+        "stroke_height": ("on_surface_strokes", "in_air_strokes"),
+        "stroke_width": ("on_surface_strokes", "in_air_strokes"),
+        "writing_length": ("on_surface_data", "in_air_data"),
+        "writing_height": ("on_surface_data", "in_air_data"),
+        "writing_width": ("on_surface_data", "in_air_data"),
+        "number_of_intra_stroke_intersections": ("IntersectionUtils", ),
+        "relative_number_of_intra_stroke_intersections": ("IntersectionUtils", ),
+        "total_number_of_intra_stroke_intersections": ("IntersectionUtils", ),
+        "relative_total_number_of_intra_stroke_intersections": ("IntersectionUtils", ),
+        "number_of_inter_stroke_intersections": ("IntersectionUtils", ),
+        "relative_number_of_inter_stroke_intersections": ("IntersectionUtils", ),
+        "vertical_peaks_indices": ("ProjectionUtils", ),
+        "vertical_valleys_indices": ("ProjectionUtils", ),
+        "vertical_peaks_values": ("ProjectionUtils", ),
+        "vertical_valleys_values": ("ProjectionUtils", ),
+        "vertical_peaks_velocity": ("ProjectionUtils", ),
+        "vertical_valleys_velocity": ("ProjectionUtils", ),
+        "vertical_peaks_distance": ("ProjectionUtils", ),
+        "vertical_valleys_distance": ("ProjectionUtils", ),
+        "vertical_peaks_duration": ("ProjectionUtils", ),
+        "vertical_valleys_duration": ("ProjectionUtils", ),
+
+        # 4. Temporal features
+        "stroke_duration": ("stroke_durations", ),
+        "ratio_of_stroke_durations": ("stroke_durations", ),
+        "writing_duration": ("stroke_durations", ),
+        "ratio_of_writing_durations": ("stroke_durations", ),
+
+        # 5. Composite features
+        "writing_tempo": ("stroke_lengths", "stroke_durations"),
+        "writing_stops": ("compute_strokes_increments", ),
+        "number_of_changes_in_x_profile": ("FilteredSignalBank", ),
+        "number_of_changes_in_y_profile": ("FilteredSignalBank", ),
+        "number_of_changes_in_azimuth": ("FilteredSignalBank", ),
+        "number_of_changes_in_tilt": ("FilteredSignalBank", ),
+        "number_of_changes_in_pressure": ("FilteredSignalBank", ),
+        "number_of_changes_in_velocity_profile": ("on_surface_strokes", ),
+        "relative_number_of_changes_in_x_profile": ("FilteredSignalBank", ),
+        "relative_number_of_changes_in_y_profile": ("FilteredSignalBank", ),
+        "relative_number_of_changes_in_azimuth": ("FilteredSignalBank", ),
+        "relative_number_of_changes_in_tilt": ("FilteredSignalBank", ),
+        "relative_number_of_changes_in_pressure": ("FilteredSignalBank", ),
+        "relative_number_of_changes_in_velocity_profile": ("on_surface_strokes", ),
+    }
+
     @classmethod
     def get_feature_arguments(cls, feature_name):
         """
@@ -838,3 +970,30 @@ class HandwritingFeaturesSettings(object):
         :rtype: bool
         """
         return cls.settings.get(feature_name, {}).get("properties", {}).get("is_multi_valued", False)
+
+    @classmethod
+    def get_feature_intermediates(cls, feature_name):
+        """
+        Gets the feature's intermediates (including the intermediates they are computed from).
+
+        :param feature_name: feature name
+        :type feature_name: str
+        :return: intermediates (ordered topologically, i.e. an intermediate follows its dependencies)
+        :rtype: tuple
+        """
+
+        # Prepare the intermediates
+        intermediates = []
+
+        # Visit the intermediates (depth-first, the dependencies first)
+        def visit(intermediate):
+            if intermediate not in intermediates:
+                for dependency in cls.intermediates.get(intermediate, ()):
+                    visit(dependency)
+                intermediates.append(intermediate)
+
+        for intermediate in cls.dependencies.get(feature_name, ()):
+            visit(intermediate)
+
+        # Return the intermediates
+        return tuple(intermediates)
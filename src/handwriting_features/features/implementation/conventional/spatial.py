@@ -24,12 +24,16 @@ def stroke_length(sample_wrapper, in_air):
     if not strokes:
         return numpy.nan
 
-    # Get the strokes length
-    length = [sum(numpy.sqrt(derivation(stroke.x) ** 2 + derivation(stroke.y) ** 2)) for stroke in strokes]
-    length = numpy.array(length)
+    # Return the strokes length (shared by the features, e.g. by the writing tempo)
+    return sample_wrapper.get_intermediate(
+        ("stroke_lengths", in_air),
+        lambda: _compute_stroke_length(sample_wrapper.stroke_data, in_air))
 
-    # Return the length
-    return length
+
+def _compute_stroke_length(stroke_data, in_air):
+    """Computes the strokes length (sums the lengths of the line segments within the strokes)"""
+    segments = numpy.sqrt(derivation(stroke_data.data["x"]) ** 2 + derivation(stroke_data.data["y"]) ** 2)
+    return stroke_data.reduce_increments(numpy.add, segments, in_air)
 
 
 def stroke_height(sample_wrapper, in_air):
@@ -53,8 +57,13 @@ def stroke_height(sample_wrapper, in_air):
     if not strokes:
         return numpy.nan
 
+    # Get the stroke data
+    stroke_data = sample_wrapper.stroke_data
+
     # Return the stokes height
-    return numpy.array([max(stroke.y) - min(stroke.y) for stroke in strokes])
+    return \
+        stroke_data.reduce(numpy.maximum, stroke_data.data["y"], in_air) - \
+        stroke_data.reduce(numpy.minimum, stroke_data.data["y"], in_air)
 
 
 def stroke_width(sample_wrapper, in_air):
@@ -78,8 +87,13 @@ def stroke_width(sample_wrapper, in_air):
     if not strokes:
         return numpy.nan
 
+    # Get the stroke data
+    stroke_data = sample_wrapper.stroke_data
+
     # Return the stokes width
-    return numpy.array([max(stroke.x) - min(stroke.x) for stroke in strokes])
+    return \
+        stroke_data.reduce(numpy.maximum, stroke_data.data["x"], in_air) - \
+        stroke_data.reduce(numpy.minimum, stroke_data.data["x"], in_air)
 
 
 def writing_length(sample_wrapper, in_air):
@@ -157,76 +171,100 @@ def writing_width(sample_wrapper, in_air):
     return float(numpy.max(sample.x) - numpy.min(sample.x))
 
 
-def number_of_intra_stroke_intersections(sample_wrapper):
+def number_of_intra_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns number of intra-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: number of intra-stroke intersections
     :rtype: numpy.ndarray or np.NaN
     """
-    return IntersectionUtils(sample_wrapper).get_number_of_intra_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_number_of_intra_stroke_intersections()
 
 
-def relative_number_of_intra_stroke_intersections(sample_wrapper):
+def relative_number_of_intra_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns relative number of intra-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: relative number of intra-stroke intersections
     :rtype: numpy.ndarray or np.NaN
     """
-    return IntersectionUtils(sample_wrapper).get_relative_number_of_intra_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_relative_number_of_intra_stroke_intersections()
 
 
-def total_number_of_intra_stroke_intersections(sample_wrapper):
+def total_number_of_intra_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns total number of intra-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: total number of intra-stroke intersections
     :rtype: int
     """
-    return IntersectionUtils(sample_wrapper).get_total_number_of_intra_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_total_number_of_intra_stroke_intersections()
 
 
-def relative_total_number_of_intra_stroke_intersections(sample_wrapper):
+def relative_total_number_of_intra_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns relative total number of intra-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: relative total number of intra-stroke intersections
     :rtype: float
     """
-    return IntersectionUtils(sample_wrapper).get_relative_total_number_of_intra_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_relative_total_number_of_intra_stroke_intersections()
 
 
-def number_of_inter_stroke_intersections(sample_wrapper):
+def number_of_inter_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns number of inter-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: number of inter-stroke intersections
     :rtype: int
     """
-    return IntersectionUtils(sample_wrapper).get_number_of_inter_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_number_of_inter_stroke_intersections()
 
 
-def relative_number_of_inter_stroke_intersections(sample_wrapper):
+def relative_number_of_inter_stroke_intersections(sample_wrapper, block_size=None):
     """
     Returns relative number of inter-stroke intersections.
 
     :param sample_wrapper: sample wrapper object
     :type sample_wrapper: HandwritingSampleWrapper
+    :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+    :type block_size: int, optional
     :return: relative number of inter-stroke intersections
     :rtype: float
     """
-    return IntersectionUtils(sample_wrapper).get_relative_number_of_inter_stroke_intersections()
+    return IntersectionUtils.from_sample_wrapper(
+        sample_wrapper=sample_wrapper,
+        block_size=block_size).get_relative_number_of_inter_stroke_intersections()
 
 
 def vertical_peaks_indices(sample_wrapper, fs, n=None):
@@ -242,7 +280,7 @@ def vertical_peaks_indices(sample_wrapper, fs, n=None):
     :return: vertical peaks indices
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_peaks_indices()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_peaks_indices()
 
 
 def vertical_valleys_indices(sample_wrapper, fs, n=None):
@@ -258,7 +296,7 @@ def vertical_valleys_indices(sample_wrapper, fs, n=None):
     :return: vertical valleys indices
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_valleys_indices()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_valleys_indices()
 
 
 def vertical_peaks_values(sample_wrapper, fs, n=None):
@@ -274,7 +312,7 @@ def vertical_peaks_values(sample_wrapper, fs, n=None):
     :return: vertical peaks values
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_peaks_values()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_peaks_values()
 
 
 def vertical_valleys_values(sample_wrapper, fs, n=None):
@@ -290,7 +328,7 @@ def vertical_valleys_values(sample_wrapper, fs, n=None):
     :return: vertical valleys values
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_valleys_values()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_valleys_values()
 
 
 def vertical_peaks_velocity(sample_wrapper, fs, n=None):
@@ -306,7 +344,7 @@ def vertical_peaks_velocity(sample_wrapper, fs, n=None):
     :return: vertical peaks velocity
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_peaks_velocity()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_peaks_velocity()
 
 
 def vertical_valleys_velocity(sample_wrapper, fs, n=None):
@@ -322,7 +360,7 @@ def vertical_valleys_velocity(sample_wrapper, fs, n=None):
     :return: vertical valleys velocity
     :rtype: numpy.ndarray or np.NaN
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_valleys_velocity()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_valleys_velocity()
 
 
 def vertical_peaks_distance(sample_wrapper, fs, n=None):
@@ -338,7 +376,7 @@ def vertical_peaks_distance(sample_wrapper, fs, n=None):
     :return: vertical peaks distance
     :rtype: int
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_peaks_distance()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_peaks_distance()
 
 
 def vertical_valleys_distance(sample_wrapper, fs, n=None):
@@ -354,7 +392,7 @@ def vertical_valleys_distance(sample_wrapper, fs, n=None):
     :return: vertical valleys distance
     :rtype: int
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_valleys_distance()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_valleys_distance()
 
 
 def vertical_peaks_duration(sample_wrapper, fs, n=None):
@@ -370,7 +408,7 @@ def vertical_peaks_duration(sample_wrapper, fs, n=None):
     :return: vertical peaks duration
     :rtype:
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_peaks_duration()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_peaks_duration()
 
 
 def vertical_valleys_duration(sample_wrapper, fs, n=None):
@@ -386,4 +424,4 @@ def vertical_valleys_duration(sample_wrapper, fs, n=None):
     :return: vertical valleys duration
     :rtype:
     """
-    return ProjectionUtils(sample_wrapper, fs=fs, n=n).vertical_valleys_duration()
+    return ProjectionUtils.from_sample_wrapper(sample_wrapper, fs=fs, n=n).vertical_valleys_duration()
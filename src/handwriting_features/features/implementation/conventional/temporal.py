@@ -22,8 +22,17 @@ def stroke_duration(sample_wrapper, in_air):
     if not strokes:
         return numpy.nan
 
-    # Return the stokes duration
-    return numpy.array([max(stroke.time) - min(stroke.time) for stroke in strokes])
+    # Return the stokes duration (shared by the features, e.g. by the ratio of stroke durations)
+    return sample_wrapper.get_intermediate(
+        ("stroke_durations", in_air),
+        lambda: _compute_stroke_duration(sample_wrapper.stroke_data, in_air))
+
+
+def _compute_stroke_duration(stroke_data, in_air):
+    """Computes the strokes duration"""
+    return \
+        stroke_data.reduce(numpy.maximum, stroke_data.data["time"], in_air) - \
+        stroke_data.reduce(numpy.minimum, stroke_data.data["time"], in_air)
 
 
 def ratio_of_stroke_durations(sample_wrapper):
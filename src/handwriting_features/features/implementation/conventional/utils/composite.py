@@ -1,6 +1,4 @@
 import numpy
-import functools
-from copy import deepcopy
 from handwriting_features.data.utils.math import derivation
 from handwriting_features.data.utils.dsp import LowPassFilter, GaussianFilter
 from handwriting_features.data.exceptions.dsp import FiltrationError
@@ -26,134 +24,174 @@ class WritingTempoUtils(object):
 class WritingStopsUtils(object):
     """Class implementing writing stops utils"""
 
+    # Velocity of the stops (value <= 1 mm/s is set to 0)
+    stop_velocity = 1
+
+    # Minimum duration of the stops (15 ms)
+    stop_duration = 0.015
+
     def __init__(self, sample_wrapper):
         """Initializes the writing stops utils object"""
 
-        # Set the strokes and indices
-        self.strokes = sample_wrapper.strokes
-        self.indices = self._get_stroke_indexes([stroke for _, stroke in self.strokes])
+        # Set the increments of the on-surface strokes (all strokes at once)
+        self.dx, self.dy, self.dt, self.indices = sample_wrapper.compute_strokes_increments(in_air=False)
 
     def get_writing_stops(self):
-        """Extracts the stroke stops"""
-
-        # Prepare the stops
-        time = numpy.nan
-        stops_borders_left = []
-        stops_borders_right = []
-
-        # Extract the stops
-        for (pen_status, stroke), index in zip(self.strokes, self.indices):
-            if pen_status == "in_air":
-                continue
+        """
+        Extracts the stroke stops.
 
-            # Compute the vector of length, time
-            length = numpy.sqrt(numpy.power(derivation(stroke.x), 2) + numpy.power(derivation(stroke.y), 2))
-            time = derivation(stroke.time)
+        The stops of all on-surface strokes are detected at once: the runs of the zero velocity
+        are found within the strokes, the runs lasting at least 15 ms are taken, and the runs
+        closer than 30 ms (within a stroke) are fuzed.
+        """
 
-            # Compute the vector of velocity (value <= 1 mm/s is set to 0)
-            velocity = (d / t for (d, t) in zip(length, time))
-            velocity = numpy.array([0 if v <= 1 else v for v in velocity])
+        # Handle no on-surface increments
+        if not self.dt.size:
+            return numpy.array([])
 
-            # Get the number of samples equaling to 15 ms
-            num_samples = numpy.ceil(0.015 / numpy.mean(time))
+        # Get the strokes of the increments (the first increment and the number of the increments)
+        _, starts, counts = numpy.unique(self.indices, return_index=True, return_counts=True)
+        strokes = numpy.repeat(numpy.arange(starts.size), counts)
 
-            # Identify the stops
-            border_left, border_right = self._get_borders(velocity)
+        # Compute the vector of velocity (value <= 1 mm/s is set to 0)
+        velocity = numpy.sqrt(numpy.power(self.dx, 2) + numpy.power(self.dy, 2)) / self.dt
+        zero = velocity <= self.stop_velocity
 
-            # Take only pauses lasting at least 15 ms
-            pause_indices = numpy.where((border_right - border_left) > num_samples)[0]
-            border_left = border_left[pause_indices].astype(float)
-            border_right = border_right[pause_indices].astype(float)
+        # Get the number of samples equaling to 15 ms (for each stroke)
+        times = numpy.split(self.dt, starts[1:])
+        num_samples = numpy.ceil(self.stop_duration / numpy.array([numpy.mean(time) for time in times]))
 
-            # Fuze the pauses
-            border_left, border_right = self._fuze_pauses(border_left, border_right, num_samples)
+        # Identify the stops
+        border_left, border_right, stops_strokes = self._get_borders(zero, strokes, starts, counts)
 
-            # Add the starting index of the stroke
-            border_left += index
-            border_right += index - 1
+        # Take only pauses lasting at least 15 ms
+        num_samples = num_samples[stops_strokes]
+        pauses = (border_right - border_left) > num_samples
+        border_left, border_right = border_left[pauses], border_right[pauses]
 
-            # Append the borders to the stops
-            stops_borders_left += border_left.tolist()
-            stops_borders_right += border_right.tolist()
+        # Fuze the pauses
+        border_left, border_right = self._fuze_pauses(
+            border_left, border_right, stops_strokes[pauses], num_samples[pauses])
 
-        # Get the writing stops
-        stops = (numpy.array(stops_borders_right) - numpy.array(stops_borders_left)) * numpy.mean(time)
-        stops = numpy.array(stops)
+        # Get the writing stops (in the mean time difference of the last stroke)
+        stops = (border_right - border_left - 1) * numpy.mean(times[-1])
 
         # Return the writing stops
         return stops
 
     @classmethod
-    def _get_stroke_indexes(cls, strokes):
-        """Gets the indexes of the strokes"""
+    def _get_borders(cls, zero, strokes, starts, counts):
+        """
+        Gets borders of the runs of zeros within the strokes.
 
-        # Prepare the list of indexes
-        indexes = []
+        The left border is the index preceding the run (0 for the run starting the stroke), the right border
+        is the last index of the run (the length of the stroke for the run ending the stroke); the borders
+        are indexed within the strokes.
+        """
 
-        # Get the indexes
-        for i in range(len(strokes)):
-            if i == 0:
-                indexes.append(0)
-            else:
-                indexes.append(indexes[i - 1] + len(strokes[i - 1].time))
+        # Get the runs starting/ending within the strokes
+        same_stroke = strokes[1:] == strokes[:-1]
+        after = numpy.concatenate(([False], zero[:-1] & same_stroke))
+        before = numpy.concatenate((zero[1:] & same_stroke, [False]))
 
-        # Return the indexes
-        return indexes
+        run_starts = numpy.flatnonzero(zero & ~after)
+        run_ends = numpy.flatnonzero(zero & ~before)
+
+        # Get the strokes of the runs, and the indices of the runs within the strokes
+        stops_strokes = strokes[run_starts]
+        run_starts = run_starts - starts[stops_strokes]
+        run_ends = run_ends - starts[stops_strokes]
+
+        # Get the borders
+        border_left = numpy.maximum(run_starts - 1, 0).astype(float)
+        border_right = numpy.where(run_ends == counts[stops_strokes] - 1, counts[stops_strokes], run_ends)
+        border_right = border_right.astype(float)
+
+        # Return the borders and the strokes of the runs
+        return border_left, border_right, stops_strokes
 
     @classmethod
-    def _get_borders(cls, array, border_value=0):
-        """Gets borders of an array given a border value"""
+    def _fuze_pauses(cls, border_left, border_right, strokes, num_samples):
+        """Fuzes the pauses (the subsequent pauses of a stroke closer than 2 * <num_samples>)"""
 
-        # Get the shifted arrays
-        array_l = array[:-1]
-        array_r = array[1:]
+        # Handle less than two pauses
+        if border_left.size < 2:
+            return border_left, border_right
 
-        # Get the borders
-        border_l = numpy.where(numpy.logical_and(array_r == border_value, array_l != border_value))[0]
-        border_r = numpy.where(numpy.logical_and(array_r != border_value, array_l == border_value))[0]
+        # Get the pauses fuzed with the following pause
+        fuzed = (strokes[1:] == strokes[:-1]) & ((border_left[1:] - border_right[:-1]) < (2 * num_samples[:-1]))
 
-        if array[0] == border_value:
-            border_l = numpy.array([0] + border_l.tolist())
-        if array[-1] == border_value:
-            border_r = numpy.array(border_r.tolist() + [len(array)])
+        # Get the first/last pauses of the fuzed pauses
+        first = numpy.concatenate(([True], ~fuzed))
+        last = numpy.concatenate((~fuzed, [True]))
 
-        # Return the borders
-        return border_l, border_r
+        # Return the fused pauses
+        return border_left[first], border_right[last]
 
-    @classmethod
-    def _fuze_pauses(cls, border_left, border_right, num_samples):
-        """Fuzes the pauses"""
 
-        # Fuze the pauses
-        if len(border_left) > 1:
-            for i in range(len(border_left) - 1):
-                if border_left[i + 1] - border_right[i] < (2 * num_samples):
-                    border_left[i + 1], border_right[i] = numpy.nan, numpy.nan
+class FilteredSignalBank(object):
+    """Class implementing the bank of filtered signals (shared by the features of a sample)"""
+
+    def __init__(self, sample_wrapper, fs, n):
+        """
+        Initializes the filtered signal bank object.
+
+        :param fs: sampling frequency
+        :type fs: float
+        :param n: number of samples of a Gaussian filter
+        :type n: int
+        """
 
-            # Get the improper pauses
-            to_remove = [
-                i for i, (l, r) in enumerate(zip(border_left, border_right))
-                if numpy.isnan(l) and numpy.isnan(r)
-            ]
+        # Set the on-surface strokes (the bank is shared by the sample wrapper, so it doesn't keep a reference to it)
+        self.strokes = sample_wrapper.on_surface_strokes
 
-            # Remove improper pauses
-            border_left = numpy.delete(border_left, to_remove)
-            border_right = numpy.delete(border_right, to_remove)
+        # Set the filter instance
+        self.gaussian_filter = GaussianFilter(fs, n)
 
-            # Update the pauses
-            nans_right = numpy.isnan(border_right)
-            if nans_right.any():
+        # Prepare the filtered signals (channel -> filtered signal)
+        self.gaussian_filtered = {}
 
-                border_right = numpy.array([
-                    border_right[i + 1] if is_nan else border_right[i]
-                    for i, is_nan in zip(range(len(border_right)), nans_right)
-                ])
+    @classmethod
+    def from_sample_wrapper(cls, sample_wrapper, fs, n):
+        """
+        Gets the filtered signal bank shared by all features of the sample.
 
-                border_left = numpy.delete(border_left, numpy.where(nans_right)[0] + 1)
-                border_right = numpy.delete(border_right, numpy.where(nans_right)[0] + 1)
+        :param sample_wrapper: sample wrapper object
+        :type sample_wrapper: HandwritingSampleWrapper
+        :param fs: sampling frequency
+        :type fs: float
+        :param n: number of samples of a Gaussian filter
+        :type n: int
+        :return: filtered signal bank object
+        :rtype: FilteredSignalBank
+        """
+        return sample_wrapper.get_intermediate((cls.__name__, fs, n), lambda: cls(sample_wrapper, fs, n))
 
-        # Return the fused pauses
-        return border_left, border_right
+    def get_gaussian_filtered(self, channel):
+        """
+        Gets the channel of the on-surface strokes filtered by the Gaussian filter.
+
+        :param channel: channel name ("x", "y", "azimuth", "tilt", "pressure")
+        :type channel: str
+        :return: filtered channel of the strokes
+        :rtype: list
+        """
+        filtered, lengths = self.get_gaussian_filtered_padded(channel)
+        return [row[:length] for row, length in zip(filtered, lengths)]
+
+    def get_gaussian_filtered_padded(self, channel):
+        """
+        Gets the channel of the on-surface strokes filtered by the Gaussian filter (all strokes at once).
+
+        :param channel: channel name ("x", "y", "azimuth", "tilt", "pressure")
+        :type channel: str
+        :return: filtered channel of the strokes (one stroke per row, padded by NaNs), lengths of the strokes
+        :rtype: tuple
+        """
+        if channel not in self.gaussian_filtered:
+            self.gaussian_filtered[channel] = self.gaussian_filter.filter_padded(
+                [getattr(stroke, channel) for stroke in self.strokes])
+        return self.gaussian_filtered[channel]
 
 
 class WritingNumberOfChangesUtils(object):
@@ -177,8 +215,8 @@ class WritingNumberOfChangesUtils(object):
         :type subset: list, optional
         """
 
-        # Set the sample wrapper
-        self.sample_wrapper = deepcopy(sample_wrapper)
+        # Set the sample wrapper (the utils don't modify it, so it is shared, not copied)
+        self.sample_wrapper = sample_wrapper
 
         # Set the DSP arguments
         self.fs = fs
@@ -189,44 +227,38 @@ class WritingNumberOfChangesUtils(object):
         self.low_pass_filter = LowPassFilter(self.fs, self.fc)
         self.gaussian_filter = GaussianFilter(self.fs, self.n)
 
+        # Validate the length of the sample (the low-pass filtration fails for too short samples)
+        self.low_pass_filter.validate_length(len(self.sample_wrapper.sample_time))
+
         # Get the duration
         self.duration = self.sample_wrapper.sample_time[-1] - self.sample_wrapper.sample_time[0]
 
-        # Filter x, y, azimuth, tilt, and pressure by a low-pass filter
-        self.sample_wrapper.sample = self._filter_data_with_low_pass_filter(self.sample_wrapper.sample)
-
         # Get the on-surface strokes
         self.strokes = self.sample_wrapper.on_surface_strokes
 
         # Set the subset of the features to return
         self.subset = subset
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_x_profile(self):
         """Gets the number of changes in x profile"""
-        return sum(self._get_changes(self._filter_data_with_gaussian_filter(s).x) for s in self.strokes)
+        return self._get_number_of_changes_in_channel("x")
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_y_profile(self):
         """Gets the number of changes in y profile"""
-        return sum(self._get_changes(self._filter_data_with_gaussian_filter(s).y) for s in self.strokes)
+        return self._get_number_of_changes_in_channel("y")
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_azimuth(self):
         """Gets the number of changes in azimuth"""
-        return sum(self._get_changes(self._filter_data_with_gaussian_filter(s).azimuth) for s in self.strokes)
+        return self._get_number_of_changes_in_channel("azimuth")
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_tilt(self):
         """Gets the number of changes in tilt"""
-        return sum(self._get_changes(self._filter_data_with_gaussian_filter(s).tilt) for s in self.strokes)
+        return self._get_number_of_changes_in_channel("tilt")
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_pressure(self):
         """Gets the number of changes in pressure"""
-        return sum(self._get_changes(self._filter_data_with_gaussian_filter(s).pressure) for s in self.strokes)
+        return self._get_number_of_changes_in_channel("pressure")
 
-    @functools.lru_cache(maxsize=1)
     def get_number_of_changes_in_velocity_profile(self):
         """Gets the number of changes in velocity profile"""
 
@@ -289,31 +321,29 @@ class WritingNumberOfChangesUtils(object):
         # Return the changes
         return changes_left + changes_right
 
-    def _filter_data_with_low_pass_filter(self, signal):
-        """Filters an input sample/stroke data by a low-pass filter"""
+    @classmethod
+    def _get_changes_padded(cls, signals, lengths):
+        """Gets the changes of the padded signals (one signal per row, the signals have the lengths)"""
+
+        # Get the mask of the inner samples of the signals
+        mask = numpy.arange(max(signals.shape[1] - 2, 0))[numpy.newaxis, :] < (lengths - 2)[:, numpy.newaxis]
 
-        # Filter the signal
-        signal.x = self.low_pass_filter.filter(signal.x)
-        signal.y = self.low_pass_filter.filter(signal.y)
-        signal.azimuth = self.low_pass_filter.filter(signal.azimuth)
-        signal.tilt = self.low_pass_filter.filter(signal.tilt)
-        signal.pressure = self.low_pass_filter.filter(signal.pressure)
+        # Get the left/right side changes
+        inner, left, right = signals[:, 1:-1], signals[:, :-2], signals[:, 2:]
+        changes_left = numpy.sum(mask & (inner > left) & (inner > right))
+        changes_right = numpy.sum(mask & (inner < left) & (inner < right))
 
-        # Return the filtered signal
-        return signal
+        # Return the changes
+        return changes_left + changes_right
 
-    def _filter_data_with_gaussian_filter(self, signal):
-        """Filters an input sample/stroke data by a Gaussian filter"""
+    def _get_number_of_changes_in_channel(self, channel):
+        """Gets the number of changes in a channel of the on-surface strokes"""
 
-        # Filter the signal
-        signal.x = self.gaussian_filter.filter(signal.x)
-        signal.y = self.gaussian_filter.filter(signal.y)
-        signal.azimuth = self.gaussian_filter.filter(signal.azimuth)
-        signal.tilt = self.gaussian_filter.filter(signal.tilt)
-        signal.pressure = self.gaussian_filter.filter(signal.pressure)
+        # Get the filtered signal bank (filters only the channels in use, once per sample)
+        filtered_signals = FilteredSignalBank.from_sample_wrapper(self.sample_wrapper, self.fs, self.n)
 
-        # Return the filtered signal
-        return signal
+        # Return the number of changes in the channel filtered by a Gaussian filter (all strokes at once)
+        return self._get_changes_padded(*filtered_signals.get_gaussian_filtered_padded(channel))
 
     def _filter_velocity_with_low_pass_filter(self, velocity):
         """Filters an input velocity by a low-pass filter"""
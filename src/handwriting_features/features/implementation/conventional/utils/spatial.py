@@ -1,25 +1,29 @@
 import numpy
 import functools
-from copy import deepcopy
-from handwriting_features.data.utils.math import intersection
+from handwriting_features.data.utils.math import intersection, intersection_between_curves
 from handwriting_features.data.utils.math import derivation
-from handwriting_features.data.utils.dsp import GaussianFilter, segment
+from handwriting_features.data.utils.dsp import GaussianFilter, segment_channels
 
 
 class IntersectionUtils(object):
     """Class implementing intersection utils"""
 
-    def __init__(self, sample_wrapper):
-        """Initializes writing intersection object"""
+    def __init__(self, sample_wrapper, block_size=None):
+        """
+        Initializes writing intersection object.
+
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+        :type block_size: int, optional
+        """
 
-        # Set the sample wrapper
-        self.sample_wrapper = deepcopy(sample_wrapper)
+        # Set the block size bounding the pairs of line segments tested at once
+        self.block_size = block_size
 
-        # Get the duration
-        self.duration = self.sample_wrapper.sample_time[-1] - self.sample_wrapper.sample_time[0]
+        # Get the duration (the utils are shared by the sample wrapper, so they don't keep a reference to it)
+        self.duration = sample_wrapper.sample_time[-1] - sample_wrapper.sample_time[0]
 
         # Get the on-surface strokes
-        self.on_surface_strokes = self.sample_wrapper.on_surface_strokes
+        self.on_surface_strokes = sample_wrapper.on_surface_strokes
 
         # Set the number of intra-stroke and inter-stroke intersections per stroke
         self.abs_num_intra = numpy.zeros((len(self.on_surface_strokes), 1), dtype=int)
@@ -27,14 +31,29 @@ class IntersectionUtils(object):
         self.abs_num_inter = 0
         self.rel_num_inter = 0.
 
-        # Set the concatenated vector of strokes and intersections
-        self.all_x = []
-        self.all_y = []
+        # Set the intra-stroke intersections
         self.intra_all = []
 
         # Compute the intra-stroke and inter-stroke intersections
         self._compute_intersections()
 
+    @classmethod
+    def from_sample_wrapper(cls, sample_wrapper, block_size=None):
+        """
+        Gets the writing intersection object shared by all features of the sample.
+
+        The block size affects only the computation (not the intersections), so the object
+        computed first is shared regardless of the block size.
+
+        :param sample_wrapper: sample wrapper object
+        :type sample_wrapper: HandwritingSampleWrapper
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to None
+        :type block_size: int, optional
+        :return: writing intersection object
+        :rtype: IntersectionUtils
+        """
+        return sample_wrapper.get_intermediate(cls.__name__, lambda: cls(sample_wrapper, block_size=block_size))
+
     def get_number_of_intra_stroke_intersections(self):
         """Extracts the number of intra-stroke intersections"""
         return numpy.NaN if not self.on_surface_strokes else self.abs_num_intra.T
@@ -59,13 +78,41 @@ class IntersectionUtils(object):
         """Extracts the relative number of inter-stroke intersections"""
         return 0. if not self.on_surface_strokes else round(float(self.rel_num_inter), 6)
 
-    @functools.lru_cache(maxsize=1)
+    def _get_overlapping_strokes(self):
+        """Gets the pairs of on-surface strokes with overlapping bounding boxes"""
+
+        # Prepare the bounding boxes of the strokes
+        x_min = numpy.array([numpy.min(stroke.x) for stroke in self.on_surface_strokes], dtype=float)
+        x_max = numpy.array([numpy.max(stroke.x) for stroke in self.on_surface_strokes], dtype=float)
+        y_min = numpy.array([numpy.min(stroke.y) for stroke in self.on_surface_strokes], dtype=float)
+        y_max = numpy.array([numpy.max(stroke.y) for stroke in self.on_surface_strokes], dtype=float)
+
+        # Sort the strokes by the beginning of their x-intervals
+        order = numpy.argsort(x_min, kind="stable")
+
+        # Sweep the x-intervals: the candidates of a stroke begin before the stroke ends
+        ends = numpy.searchsorted(x_min[order], x_max[order], side="right")
+
+        pairs = []
+
+        for position, end in enumerate(ends):
+            a = order[position]
+            b = order[position + 1:end]
+
+            # Take only the strokes with overlapping y-intervals
+            b = b[(y_min[b] <= y_max[a]) & (y_min[a] <= y_max[b])]
+            pairs.extend((min(a, c), max(a, c)) for c in b.tolist())
+
+        # Return the pairs of strokes
+        return sorted(pairs)
+
     def _compute_intersections(self):
         """Computes the intra-stroke and inter-stroke intersections"""
 
         # Compute the intra-stroke intersections
         for i, stroke in enumerate(self.on_surface_strokes):
-            intersections = [(x, y) for x, y in intersection(stroke.x, stroke.y) if x is not None and y is not None]
+            intersections = intersection(stroke.x, stroke.y, block_size=self.block_size)
+            intersections = [(x, y) for x, y in intersections if x is not None and y is not None]
 
             # Handle the intra-stroke intersections
             if intersections:
@@ -73,19 +120,18 @@ class IntersectionUtils(object):
                 self.rel_num_intra[i] = len(intersections) / (stroke.time[-1] - stroke.time[0])
                 self.intra_all.extend(intersections)
 
-            # Add the stroke to the concatenated vector
-            self.all_x.extend([x for x in stroke.x] + [numpy.nan])
-            self.all_y.extend([y for y in stroke.y] + [numpy.nan])
-
-        self.all_x = numpy.array(self.all_x)
-        self.all_y = numpy.array(self.all_y)
-
-        # Compute the inter-stroke intersections
-        intersections = [(x, y) for x, y in intersection(self.all_x, self.all_y) if x is not None and y is not None]
+        # Compute the inter-stroke intersections (only the strokes with overlapping bounding boxes)
+        intersections = intersection_between_curves(
+            [stroke.x for stroke in self.on_surface_strokes],
+            [stroke.y for stroke in self.on_surface_strokes],
+            pairs=self._get_overlapping_strokes(),
+            block_size=self.block_size)
+        intersections = [(x, y) for x, y in intersections]
 
         # Handle the inter-stroke intersections
         if self.intra_all:
-            intersections = [i for i in intersections if i not in self.intra_all]
+            intra_all = set(self.intra_all)
+            intersections = [i for i in intersections if i not in intra_all]
         if intersections:
             self.abs_num_inter = len(intersections)
             self.rel_num_inter = len(intersections) / self.duration
@@ -110,11 +156,8 @@ class ProjectionUtils(object):
         :type n: int
         """
 
-        # Set the sample wrapper
-        self.sample_wrapper = deepcopy(sample_wrapper)
-
-        # Set the on-surface data
-        self.on_surface_data = self.sample_wrapper.on_surface_data
+        # Set the on-surface data (the utils are shared by the sample wrapper, so they don't keep a reference to it)
+        self.on_surface_data = sample_wrapper.on_surface_data
 
         # Set the DSP arguments
         self.fs = fs
@@ -135,7 +178,23 @@ class ProjectionUtils(object):
         # Compute the projections
         self._compute_projections()
 
-    @functools.lru_cache(maxsize=1)
+    @classmethod
+    def from_sample_wrapper(cls, sample_wrapper, fs, n=None):
+        """
+        Gets the writing projection object shared by all features of the sample.
+
+        :param sample_wrapper: sample wrapper object
+        :type sample_wrapper: HandwritingSampleWrapper
+        :param fs: sampling frequency
+        :type fs: float
+        :param n: number of samples of a Gaussian filter, defaults to 50
+        :type n: int
+        :return: writing projection object
+        :rtype: ProjectionUtils
+        """
+        n = n if n else cls.n
+        return sample_wrapper.get_intermediate((cls.__name__, fs, n), lambda: cls(sample_wrapper, fs=fs, n=n))
+
     def _compute_projections(self):
         """Computes the projections"""
 
@@ -143,9 +202,8 @@ class ProjectionUtils(object):
         t = self.on_surface_data.time
         y = self.on_surface_data.y
 
-        # Segment time and vertical movement
-        t_segmented = segment(t, self.window_size, self.window_step)
-        y_segmented = segment(y, self.window_size, self.window_step)
+        # Segment time and vertical movement (in one call)
+        t_segmented, y_segmented = segment_channels((t, y), self.window_size, self.window_step)
 
         # Reshape the segments
         t_segmented = numpy.reshape(t_segmented, (t_segmented.shape[0], t_segmented.shape[-1])).T
@@ -191,9 +249,13 @@ class ProjectionUtils(object):
                 else:
                     self.valleys[i] += 1
 
-    @functools.lru_cache(maxsize=1)
     def _compute_temporal_velocity(self):
         """Computes the temporal velocity"""
+        return self._temporal_velocity
+
+    @functools.cached_property
+    def _temporal_velocity(self):
+        """Temporal velocity (computed once per object)"""
 
         # Prepare the trajectory and time
         d = numpy.sqrt(derivation(self.on_surface_data.x) ** 2 + derivation(self.on_surface_data.y) ** 2)
@@ -202,17 +264,25 @@ class ProjectionUtils(object):
         # Return velocity
         return d / t
 
-    @functools.lru_cache(maxsize=1)
     def vertical_peaks_indices(self):
         """Extracts the vertical peaks indices"""
+        return self._vertical_peaks_indices
+
+    def vertical_valleys_indices(self):
+        """Extracts the vertical valleys indices"""
+        return self._vertical_valleys_indices
+
+    @functools.cached_property
+    def _vertical_peaks_indices(self):
+        """Vertical peaks indices (computed once per object)"""
         if all((self.time is not None, self.peaks is not None)):
             return numpy.array([numpy.where(self.on_surface_data.time == e)[0][0] for e in self.time[self.peaks]])
         else:
             return numpy.nan
 
-    @functools.lru_cache(maxsize=1)
-    def vertical_valleys_indices(self):
-        """Extracts the vertical valleys indices"""
+    @functools.cached_property
+    def _vertical_valleys_indices(self):
+        """Vertical valleys indices (computed once per object)"""
         if all((self.time is not None, self.valleys is not None)):
             return numpy.array([numpy.where(self.on_surface_data.time == e)[0][0] for e in self.time[self.valleys]])
         else:
@@ -273,3 +343,18 @@ class ProjectionUtils(object):
             return derivation(numpy.array([self.on_surface_data.time[e] for e in self.vertical_valleys_indices()]))
         else:
             return numpy.nan
+
+    def vertical_peaks_and_valleys(self):
+        """Extracts all vertical peaks and valleys features (dict: feature name -> feature)"""
+        return {
+            "vertical_peaks_indices": self.vertical_peaks_indices(),
+            "vertical_valleys_indices": self.vertical_valleys_indices(),
+            "vertical_peaks_values": self.vertical_peaks_values(),
+            "vertical_valleys_values": self.vertical_valleys_values(),
+            "vertical_peaks_velocity": self.vertical_peaks_velocity(),
+            "vertical_valleys_velocity": self.vertical_valleys_velocity(),
+            "vertical_peaks_distance": self.vertical_peaks_distance(),
+            "vertical_valleys_distance": self.vertical_valleys_distance(),
+            "vertical_peaks_duration": self.vertical_peaks_duration(),
+            "vertical_valleys_duration": self.vertical_valleys_duration()
+        }
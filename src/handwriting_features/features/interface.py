@@ -172,63 +172,83 @@ class HandwritingFeatures(HandwritingFeaturesBase):
         """
         return self.compute(self.wrapper, writing_width, in_air=in_air)
 
-    def number_of_intra_stroke_intersections(self, statistics=()):
+    def number_of_intra_stroke_intersections(self, statistics=(), *, block_size=0):
         """
         Extracts the number of intra-stroke intersections.
 
         :param statistics: statistics to compute, defaults to ()
         :type statistics: Any[list, tuple], optional
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: number of intra-stroke intersections
         :rtype: numpy.ndarray or np.NaN
         """
-        return self.compute(self.wrapper, number_of_intra_stroke_intersections, statistics=statistics)
+        return self.compute(
+            self.wrapper,
+            number_of_intra_stroke_intersections,
+            statistics=statistics,
+            block_size=block_size)
 
-    def relative_number_of_intra_stroke_intersections(self, statistics=()):
+    def relative_number_of_intra_stroke_intersections(self, statistics=(), *, block_size=0):
         """
         Extracts the relative number of intra-stroke intersections.
 
         :param statistics: statistics to compute, defaults to ()
         :type statistics: Any[list, tuple], optional
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: relative number of intra-stroke intersections
         :rtype: numpy.ndarray or np.NaN
         """
-        return self.compute(self.wrapper, relative_number_of_intra_stroke_intersections, statistics=statistics)
+        return self.compute(
+            self.wrapper,
+            relative_number_of_intra_stroke_intersections,
+            statistics=statistics,
+            block_size=block_size)
 
-    def total_number_of_intra_stroke_intersections(self):
+    def total_number_of_intra_stroke_intersections(self, *, block_size=0):
         """
         Extracts the total number of intra-stroke intersections.
 
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: total number of intra-stroke intersections
         :rtype: int
         """
-        return self.compute(self.wrapper, total_number_of_intra_stroke_intersections)
+        return self.compute(self.wrapper, total_number_of_intra_stroke_intersections, block_size=block_size)
 
-    def relative_total_number_of_intra_stroke_intersections(self):
+    def relative_total_number_of_intra_stroke_intersections(self, *, block_size=0):
         """
         Extracts the relative total number of intra-stroke intersections.
 
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: relative total number of intra-stroke intersections
         :rtype: float
         """
-        return self.compute(self.wrapper, relative_total_number_of_intra_stroke_intersections)
+        return self.compute(self.wrapper, relative_total_number_of_intra_stroke_intersections, block_size=block_size)
 
-    def number_of_inter_stroke_intersections(self):
+    def number_of_inter_stroke_intersections(self, *, block_size=0):
         """
         Extracts the number of inter-stroke intersections.
 
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: number of inter-stroke intersections
         :rtype: int
         """
-        return self.compute(self.wrapper, number_of_inter_stroke_intersections)
+        return self.compute(self.wrapper, number_of_inter_stroke_intersections, block_size=block_size)
 
-    def relative_number_of_inter_stroke_intersections(self):
+    def relative_number_of_inter_stroke_intersections(self, *, block_size=0):
         """
         Extracts the relative number of inter-stroke intersections.
 
+        :param block_size: block size bounding the pairs of line segments tested at once, defaults to 0 (no bound)
+        :type block_size: int, optional
         :return: relative number of inter-stroke intersections
         :rtype: float
         """
-        return self.compute(self.wrapper, relative_number_of_inter_stroke_intersections)
+        return self.compute(self.wrapper, relative_number_of_inter_stroke_intersections, block_size=block_size)
 
     def vertical_peaks_indices(self, fs, n=None, statistics=()):
         """
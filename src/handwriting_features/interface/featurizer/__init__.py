@@ -67,6 +67,14 @@ class FeatureExtractor(object):
         1. configuration are of type: ``dict``.
         2. configuration is optional.
         3. configuration provides common kwargs for feature extraction
+        4. configuration can set the executor of the per-subject extraction:
+           ``executor`` (``serial``, ``thread`` or ``process``), ``n_jobs``
+           and ``chunk_size``. With the executor set, the failing subjects
+           get NaN features and their errors are reported in ``failures``
+           (without the executor, the errors are raised).
+        5. configuration can set the ``transport`` of the process executor
+           (``pickle`` or ``shared_memory``). The shared memory transport
+           shares the data and the feature matrix with the workers.
 
         **Pipeline**
 
@@ -77,6 +85,9 @@ class FeatureExtractor(object):
            to hold the name of the feature to be computed, and b) ``args``
            to hold the arguments (kwargs) for the specific feature extraction
            method that is going to be used (it is of type: ``dict``).
+        5. pipeline can be also compiled in advance (the compiled pipeline is
+           used as is), see: ``MultiSubjectFeatureExtractorHandler``
+           ``.compile_pipeline(pipeline, **configuration)``.
 
         **Output**
 
@@ -86,7 +97,23 @@ class FeatureExtractor(object):
 
         :param pipeline: pipeline of the features to be extracted
         :type pipeline: list
-        :return: extracted features and labels
-        :rtype: dict {"features": ..., "labels": ...}
+        :return: extracted features, labels and failures (subject -> error)
+        :rtype: dict {"features": ..., "labels": ..., "failures": ...}
         """
         return self.handler.extract(self.values, self.labels, pipeline, **self.configuration)
+
+    def iter_extract(self, pipeline):
+        """
+        Interface method: extract the features one subject at a time.
+
+        The data, labels, configuration and pipeline follow ``extract(...)``,
+        the data can be also an iterable of the data of the subjects (e.g. a
+        generator reading the subjects from the disk). The features of the
+        subjects are not padded (they can differ in length).
+
+        :param pipeline: pipeline of the features to be extracted
+        :type pipeline: list
+        :return: generator of the subject index, the extracted features and labels
+        :rtype: Generator[tuple]
+        """
+        return self.handler.iter_extract(self.values, self.labels, pipeline, **self.configuration)
@@ -1,7 +1,15 @@
+import os
+import logging
+import multiprocessing.util
+import functools
 import numpy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from handwriting_features.features import HandwritingFeatures
 from handwriting_features.features.configuration.mapping import HandwritingFeaturesMapping
+from handwriting_features.features.configuration.planner import HandwritingFeaturesPlanner
 from handwriting_features.features.validation import HandwritingFeaturesFusion, HandwritingFeaturesValidation
+from handwriting_features.interface.featurizer.pipeline import CompiledFeaturesPipeline
+from handwriting_features.interface.featurizer.transport import SharedArray
 from handwriting_features.interface.featurizer.utils import (
     SingleSubjectFeatureUtils,
     MultiSubjectFeatureUtils,
@@ -9,6 +17,10 @@ from handwriting_features.interface.featurizer.utils import (
 )
 
 
+# Set the logging
+logger = logging.getLogger("FeatureExtractor")
+
+
 class BaseFeatureExtractorHandler(object):
     """Base class for the feature extractor handlers"""
 
@@ -21,9 +33,15 @@ class BaseFeatureExtractorHandler(object):
     # Feature mapper
     mapping = HandwritingFeaturesMapping
 
+    # Feature fusion
+    fusion = HandwritingFeaturesFusion
+
     # Feature validator
     validation = HandwritingFeaturesValidation
 
+    # Feature planner
+    planner = HandwritingFeaturesPlanner
+
 
 class SingleSubjectFeatureExtractorHandler(BaseFeatureExtractorHandler):
     """Class implementing the single-subject features extractor handler"""
@@ -32,67 +50,62 @@ class SingleSubjectFeatureExtractorHandler(BaseFeatureExtractorHandler):
     utils = SingleSubjectFeatureUtils
 
     @classmethod
-    def extract(cls, data_values, data_labels=None, pipeline=None, preparation=True, **configuration):
+    def compile_pipeline(cls, pipeline, preparation=True, **configuration):
         """
-        Extracts the features specified in the pipeline for a single subject.
+        Compiles the pipeline of the features (fuzes and validates the feature arguments, resolves
+        the feature computation methods and builds the labels). The compiled pipeline does not depend
+        on the data, i.e. it can be executed for many subjects.
 
-        :param data_values: sample values to extract the features from
-        :type data_values: numpy.ndarray
-        :param data_labels: labels for data samples, defaults to None
-        :type data_labels: list, optional
-        :param pipeline: pipeline of the features, defaults to None
-        :type pipeline: list, optional
+        :param pipeline: pipeline of the features
+        :type pipeline: list
         :param preparation: prepare the pipeline of features, defaults to True
         :type preparation: bool, optional
         :param configuration: common extractor configuration
         :type configuration: **kwargs
-        :return: extracted features and labels
-        :rtype: dict {"features": ..., "labels": ...}
+        :return: compiled features pipeline
+        :rtype: CompiledFeaturesPipeline
         """
 
-        # Initialize the handwriting features interface
-        features = cls.features.from_numpy_array(data_values, data_labels, **configuration)
-
-        # Initialize the feature mapping
-        mapping = cls.mapping(features)
-
-        # Prepare the buffers for extracted feature values/labels
-        feature_values = []
-        feature_labels = []
-
         # Prepare the features pipeline
         if preparation:
             pipeline = cls.pipeline_utils.prepare_features_pipeline(pipeline)
 
-        # Extract the features specified in the features pipeline
-        for feature in pipeline:
-
-            # Get the feature name and args
-            name = feature.get("name")
-            args = feature.get("args", {})
+        # Compile the features pipeline
+        return CompiledFeaturesPipeline.compile(
+            pipeline,
+            cls.features,
+            cls.mapping,
+            cls.fusion,
+            cls.validation,
+            cls.utils,
+            cls.planner,
+            **configuration)
 
-            # Prepare the feature args (fuze the feature args with the common configuration)
-            args = HandwritingFeaturesFusion.fuze(
-                feature.get("name"),
-                args,
-                features.config,
-                features.skip_features)
-
-            # Get the validated feature arguments
-            arguments = cls.validation.validate(name, args)
+    @classmethod
+    def extract(cls, data_values, data_labels=None, pipeline=None, preparation=True, **configuration):
+        """
+        Extracts the features specified in the pipeline for a single subject.
 
-            # Extract the feature
-            extracted = mapping.map(feature.get("name"))(**arguments)
+        :param data_values: sample values to extract the features from
+        :type data_values: numpy.ndarray
+        :param data_labels: labels for data samples, defaults to None
+        :type data_labels: list, optional
+        :param pipeline: pipeline of the features (or compiled pipeline of the features), defaults to None
+        :type pipeline: Any[list, CompiledFeaturesPipeline], optional
+        :param preparation: prepare the pipeline of features, defaults to True
+        :type preparation: bool, optional
+        :param configuration: common extractor configuration (ignored for the compiled pipeline)
+        :type configuration: **kwargs
+        :return: extracted features and labels
+        :rtype: dict {"features": ..., "labels": ...}
+        """
 
-            # Update the feature values/labels
-            feature_values.append(cls.utils.prepare_feature_values(extracted))
-            feature_labels.append(cls.utils.prepare_feature_labels(extracted, name, args))
+        # Compile the features pipeline
+        if not isinstance(pipeline, CompiledFeaturesPipeline):
+            pipeline = cls.compile_pipeline(pipeline, preparation, **configuration)
 
-        # Return the extracted feature values/labels
-        return {
-            "features": feature_values,
-            "labels": feature_labels
-        }
+        # Extract the features specified in the compiled features pipeline
+        return pipeline.execute(data_values, data_labels)
 
 
 class MultiSubjectFeatureExtractorHandler(BaseFeatureExtractorHandler):
@@ -104,36 +117,101 @@ class MultiSubjectFeatureExtractorHandler(BaseFeatureExtractorHandler):
     # Feature utils
     utils = MultiSubjectFeatureUtils
 
+    # Executors of the per-subject extraction
+    executors = {
+        "serial": None,
+        "thread": ThreadPoolExecutor,
+        "process": ProcessPoolExecutor
+    }
+
+    # Transports of the process executor
+    transports = ("pickle", "shared_memory")
+
     @classmethod
-    def extract(cls, data_values, data_labels=None, pipeline=None, **configuration):
+    def compile_pipeline(cls, pipeline, **configuration):
+        """
+        Compiles the pipeline of the features (the compiled pipeline is returned unchanged).
+
+        :param pipeline: pipeline of the features (or compiled pipeline of the features)
+        :type pipeline: Any[list, CompiledFeaturesPipeline]
+        :param configuration: common extractor configuration
+        :type configuration: **kwargs
+        :return: compiled features pipeline
+        :rtype: CompiledFeaturesPipeline
+        """
+        if isinstance(pipeline, CompiledFeaturesPipeline):
+            return pipeline
+        return cls.extractor.compile_pipeline(pipeline, **configuration)
+
+    @classmethod
+    def extract(cls, data_values, data_labels=None, pipeline=None, executor=None, n_jobs=None, chunk_size=1,
+                transport=None, **configuration):
         """
         Extracts the features specified in the pipeline for multiple subjects.
 
+        If the executor is set, the subjects are extracted independently: the features of a failing subject
+        are set to NaN values and the failure is reported in the "failures" of the output (subject -> error),
+        otherwise the failure of a subject is raised (the "failures" are empty). The order of the subjects
+        is kept in all executors.
+
         :param data_values: samples values to extract the features from
         :type data_values: numpy.ndarray
         :param data_labels: labels for data samples, defaults to None
         :type data_labels: list, optional
-        :param pipeline: pipeline of the features, defaults to None
-        :type pipeline: list, optional
+        :param pipeline: pipeline of the features (or compiled pipeline of the features), defaults to None
+        :type pipeline: Any[list, CompiledFeaturesPipeline], optional
+        :param executor: executor of the per-subject extraction (serial, thread, process), defaults to None
+        :type executor: str, optional
+        :param n_jobs: number of workers of the executor, defaults to None (number of CPUs)
+        :type n_jobs: int, optional
+        :param chunk_size: number of subjects submitted to a worker at once (process executor), defaults to 1
+        :type chunk_size: int, optional
+        :param transport: transport of the process executor (pickle, shared_memory), defaults to None (pickle)
+        :type transport: str, optional
         :param configuration: common extractor configuration
         :type configuration: **kwargs
-        :return: extracted features and labels
-        :rtype: dict {"features": ..., "labels": ...}
+        :return: extracted features, labels and failures
+        :rtype: dict {"features": ..., "labels": ..., "failures": ...}
         """
 
-        # Prepare the features pipeline
-        pipeline = cls.pipeline_utils.prepare_features_pipeline(pipeline)
+        # Compile the features pipeline
+        pipeline = cls.compile_pipeline(pipeline, **configuration)
+
+        # Validate the transport
+        if transport not in (None, *cls.transports):
+            raise ValueError(f"Unsupported transport: {transport} (supported: {', '.join(cls.transports)})")
+        if transport == "shared_memory" and executor != "process":
+            raise ValueError(f"Transport {transport} is supported by the process executor only")
 
         # Extract the features specified in the features pipeline for each subject
-        extracted = [
-            cls.extractor.extract(
-                data_values=data_values[sample, ...],
-                data_labels=data_labels,
-                pipeline=pipeline,
-                preparation=False,
+        if transport == "shared_memory":
+            return cls._extract_in_shared_memory(
+                data_values,
+                data_labels,
+                pipeline,
+                n_jobs,
+                chunk_size,
+                **configuration)
+        elif executor is None:
+            extracted = [
+                cls.extractor.extract(
+                    data_values=data_values[sample, ...],
+                    data_labels=data_labels,
+                    pipeline=pipeline,
+                    preparation=False,
+                    **configuration)
+                for sample in range(data_values.shape[0])
+            ]
+            failures = {}
+        else:
+            extracted, failures = cls._extract_in_executor(
+                data_values,
+                data_labels,
+                pipeline,
+                executor,
+                n_jobs,
+                chunk_size,
                 **configuration)
-            for sample in range(data_values.shape[0])
-        ]
 
         # Prepare the feature values/labels
         feature_values = cls.utils.prepare_feature_values(extracted, pipeline)
@@ -142,5 +220,303 @@ class MultiSubjectFeatureExtractorHandler(BaseFeatureExtractorHandler):
         # Return the extracted feature values/labels
         return {
             "features": feature_values,
-            "labels": feature_labels
+            "labels": feature_labels,
+            "failures": failures
+        }
+
+    @classmethod
+    def iter_extract(cls, samples, data_labels=None, pipeline=None, **configuration):
+        """
+        Extracts the features specified in the pipeline for multiple subjects one subject at a time.
+
+        The subjects are not consolidated, i.e. the feature vectors of the subjects can differ in length
+        (features of variable length are not padded by NaN values), see: ``extract(...)``.
+
+        :param samples: samples values to extract the features from (iterable of the values of the subjects)
+        :type samples: Iterable
+        :param data_labels: labels for data samples, defaults to None
+        :type data_labels: list, optional
+        :param pipeline: pipeline of the features (or compiled pipeline of the features), defaults to None
+        :type pipeline: Any[list, CompiledFeaturesPipeline], optional
+        :param configuration: common extractor configuration
+        :type configuration: **kwargs
+        :return: generator of the subject index, the extracted feature values and labels
+        :rtype: Generator[tuple]
+        """
+
+        # Compile the features pipeline
+        pipeline = cls.compile_pipeline(pipeline, **configuration)
+
+        # Extract the features specified in the features pipeline for each subject
+        for sample, values in enumerate(samples):
+            extracted = cls.extractor.extract(
+                data_values=numpy.asarray(values),
+                data_labels=data_labels,
+                pipeline=pipeline,
+                preparation=False,
+                **configuration)
+
+            # Yield the finalized feature values/labels
+            yield sample, \
+                cls.extractor.utils.finalize_feature_values(extracted), \
+                cls.extractor.utils.finalize_feature_labels(extracted)
+
+    @classmethod
+    def _extract_in_executor(cls, data_values, data_labels, pipeline, executor, n_jobs, chunk_size, **configuration):
+        """
+        Extracts the features for multiple subjects in the executor (isolates the failures of the subjects).
+
+        :return: extracted features and labels of the subjects, failures of the subjects (subject -> error)
+        :rtype: tuple
+        """
+
+        # Validate the executor
+        if executor not in cls.executors:
+            raise ValueError(f"Unsupported executor: {executor} (supported: {', '.join(cls.executors)})")
+
+        # Prepare the extraction of a single subject
+        extract = functools.partial(
+            _extract_subject,
+            cls.extractor,
+            data_labels=data_labels,
+            pipeline=pipeline,
+            configuration=configuration)
+
+        # Prepare the values of the subjects
+        subjects = (data_values[sample, ...] for sample in range(data_values.shape[0]))
+
+        # Extract the features for each subject (keep the order of the subjects)
+        if cls.executors[executor] is None:
+            results = list(map(extract, subjects))
+        else:
+            with cls.executors[executor](max_workers=n_jobs or os.cpu_count()) as pool:
+                results = list(pool.map(extract, subjects, chunksize=max(int(chunk_size), 1)))
+
+        # Prepare the extracted features and the failures
+        extracted, failures = [], {}
+
+        # Replace the features of the failing subjects (empty features are padded by NaN values)
+        for sample, (result, error) in enumerate(results):
+            if error is not None:
+                logger.warning(f"Feature extraction of the subject {sample} failed: {error}")
+                failures[sample] = error
+                result = {"features": [numpy.array([]) for _ in pipeline], "labels": [[] for _ in pipeline]}
+            extracted.append(result)
+
+        # Return the extracted features and the failures
+        return extracted, failures
+
+    @classmethod
+    def _extract_in_shared_memory(cls, data_values, data_labels, pipeline, n_jobs, chunk_size, **configuration):
+        """
+        Extracts the features for multiple subjects in the process executor with the shared-memory transport.
+
+        The workers attach to the shared samples values and write the feature values into the preallocated
+        shared feature matrix. Its layout (the capacity of each feature) is given by the compiled pipeline:
+        the features of known length (with statistics, single-valued) get their number of labels, the other
+        features get the number of samples of a subject. Only the values exceeding the layout and the values
+        that can not be stored as floats are returned by pickle. The feature values are then prepared in the
+        same way as in the other executors (i.e. the output is the same, including the data types).
+
+        :return: extracted features and labels, failures of the subjects (subject -> error)
+        :rtype: dict {"features": ..., "labels": ..., "failures": ...}
+        """
+
+        # Get the number of subjects and the number of samples of a subject
+        num_subjects = data_values.shape[0]
+        num_samples = max(data_values.shape[1:], default=1)
+
+        # Prepare the layout of the feature matrix (offsets of the features)
+        capacities = [len(feature.labels) if feature.labels is not None else num_samples for feature in pipeline]
+        offsets = numpy.concatenate([[0], numpy.cumsum(capacities, dtype=int)]).tolist()
+
+        # Share the samples values and prepare the shared feature matrix
+        shared_values = SharedArray.from_array(numpy.ascontiguousarray(data_values))
+        shared_features = SharedArray.create((num_subjects, offsets[-1]), fill_value=numpy.nan)
+
+        try:
+
+            # Prepare the extraction of a single subject
+            extract = functools.partial(
+                _extract_subject_into_shared_memory,
+                cls.extractor,
+                data_labels=data_labels,
+                pipeline=pipeline,
+                configuration=configuration,
+                offsets=offsets)
+
+            # Extract the features for each subject (keep the order of the subjects)
+            with ProcessPoolExecutor(
+                    max_workers=n_jobs or os.cpu_count(),
+                    initializer=_attach_shared_arrays,
+                    initargs=(shared_values.descriptor, shared_features.descriptor)) as pool:
+                results = list(pool.map(extract, range(num_subjects), chunksize=max(int(chunk_size), 1)))
+
+            # Prepare the extracted features and the failures
+            extracted, failures = [], {}
+
+            # Collect the extracted features (the failing subjects have empty features padded by NaN values)
+            for sample, (layout, overflow, labels, error) in enumerate(results):
+                if error is not None:
+                    logger.warning(f"Feature extraction of the subject {sample} failed: {error}")
+                    failures[sample] = error
+                    extracted.append({
+                        "features": [numpy.array([]) for _ in pipeline],
+                        "labels": [[] for _ in pipeline]
+                    })
+                    continue
+
+                extracted.append({
+                    "features": [
+                        _collect_feature_values(
+                            shared_features.array[sample, offsets[feature]:],
+                            length,
+                            dtype,
+                            overflow.get(feature))
+                        for feature, (length, dtype) in enumerate(layout)
+                    ],
+                    "labels": [
+                        list(feature.labels) if feature.labels is not None else labels[index]
+                        for index, feature in enumerate(pipeline)
+                    ]
+                })
+
+        finally:
+
+            # Destroy the shared arrays
+            shared_values.unlink()
+            shared_features.unlink()
+
+        # Return the extracted feature values/labels (prepared as in the other executors)
+        return {
+            "features": cls.utils.prepare_feature_values(extracted, pipeline),
+            "labels": cls.utils.prepare_feature_labels(extracted, pipeline),
+            "failures": failures
         }
+
+
+# Shared arrays of the worker process (samples values, feature matrix)
+_shared_arrays = {}
+
+
+def _attach_shared_arrays(values_descriptor, features_descriptor):
+    """Attaches the worker process to the shared samples values and the shared feature matrix"""
+    _shared_arrays["values"] = SharedArray.attach(values_descriptor)
+    _shared_arrays["features"] = SharedArray.attach(features_descriptor)
+
+    # Close the shared arrays at the exit of the worker process
+    multiprocessing.util.Finalize(None, _detach_shared_arrays, exitpriority=10)
+
+
+def _detach_shared_arrays():
+    """Closes the access of the worker process to the shared arrays"""
+    while _shared_arrays:
+        _shared_arrays.popitem()[1].close()
+
+
+def _extract_subject_into_shared_memory(extractor, sample, data_labels=None, pipeline=None, configuration=None,
+                                        offsets=None):
+    """
+    Extracts the features for a single subject and writes them into the shared feature matrix.
+
+    The values that can not be stored as floats exactly (e.g. objects) and the values exceeding the capacity
+    of the feature are returned (pickled), and so are the labels depending on the data.
+
+    :return: layout of the features (length, dtype), returned values (feature -> values), labels, error message
+    :rtype: tuple
+    """
+
+    # Extract the features for the subject
+    extracted, error = _extract_subject(
+        extractor,
+        _shared_arrays["values"].array[sample, ...],
+        data_labels,
+        pipeline,
+        configuration)
+
+    # Handle the failure of the subject
+    if extracted is None:
+        return None, None, None, error
+
+    # Write the feature values into the shared feature matrix (return the values exceeding the layout)
+    layout, overflow = [], {}
+    for feature, values in enumerate(extracted["features"]):
+        values = numpy.asarray(values)
+        layout.append((len(values), values.dtype.str))
+
+        # Return the values that can not be stored as floats exactly
+        if values.ndim != 1 or not _is_float_representable(values):
+            overflow[feature] = values
+            continue
+
+        # Write the values (up to the capacity of the feature)
+        capacity = offsets[feature + 1] - offsets[feature]
+        _shared_arrays["features"].array[sample, offsets[feature]:offsets[feature] + min(len(values), capacity)] = \
+            values[:capacity]
+        if len(values) > capacity:
+            overflow[feature] = values[capacity:]
+
+    # Prepare the labels depending on the data (the other labels are compiled)
+    labels = {
+        feature: extracted["labels"][feature]
+        for feature, compiled in enumerate(pipeline)
+        if compiled.labels is None
+    }
+
+    # Return the layout of the features, the returned values, the labels and no error
+    return layout, overflow, labels, None
+
+
+def _is_float_representable(values):
+    """Checks whether the values can be stored as floats exactly (floats, bools and integers up to 2^53)"""
+    if values.dtype.kind in "fb":
+        return True
+    if values.dtype.kind in "iu":
+        return not values.size or max(-int(values.min()), int(values.max())) <= 2 ** 53
+    return False
+
+
+def _collect_feature_values(row, length, dtype, returned):
+    """
+    Collects the feature values of a subject from the shared feature matrix and the returned values.
+
+    :param row: row of the shared feature matrix (starting at the offset of the feature)
+    :type row: numpy.ndarray
+    :param length: number of the feature values
+    :type length: int
+    :param dtype: data type of the feature values
+    :type dtype: str
+    :param returned: returned values (all values, or the values exceeding the capacity), or None
+    :type returned: numpy.ndarray
+    :return: feature values
+    :rtype: numpy.ndarray
+    """
+
+    # Handle the values returned as a whole
+    if returned is not None and (returned.ndim != 1 or len(returned) == length):
+        return returned
+
+    # Collect the values (the stored values, followed by the returned values exceeding the capacity)
+    stored = row[:length - len(returned)] if returned is not None else row[:length]
+    values = numpy.concatenate([stored, returned]) if returned is not None else numpy.array(stored)
+
+    # Return the values of the original data type
+    return values.astype(numpy.dtype(dtype), copy=False)
+
+
+def _extract_subject(extractor, data_values, data_labels=None, pipeline=None, configuration=None):
+    """
+    Extracts the features for a single subject (module-level function to be picklable by the process executor).
+
+    :return: extracted features and labels (None on failure), error message (None on success)
+    :rtype: tuple
+    """
+    try:
+        return extractor.extract(
+            data_values=data_values,
+            data_labels=data_labels,
+            pipeline=pipeline,
+            preparation=False,
+            **(configuration or {})), None
+    except Exception as e:
+        return None, f"{e.__class__.__name__}: {e}"
@@ -0,0 +1,180 @@
+from collections import namedtuple
+
+
+# Compiled feature (name, fuzed args, validated arguments, feature computation method, labels or None)
+CompiledFeature = namedtuple("CompiledFeature", ["name", "args", "arguments", "method", "labels"])
+
+
+class CompiledFeaturesPipeline(object):
+    """Class implementing the compiled (immutable) pipeline of the features"""
+
+    __slots__ = ("_features", "_configuration", "_features_class", "_utils", "_order", "_releases")
+
+    def __init__(self, features, configuration, features_class, utils, order=None, releases=None):
+        """
+        Initializes the compiled features pipeline object.
+
+        :param features: compiled features
+        :type features: tuple
+        :param configuration: common extractor configuration
+        :type configuration: dict
+        :param features_class: handwriting features class
+        :type features_class: type
+        :param utils: single-subject feature utils
+        :type utils: type
+        :param order: order of the computation (indices of the features), defaults to None (pipeline order)
+        :type order: tuple, optional
+        :param releases: intermediates to release after each step of the computation, defaults to None
+        :type releases: tuple, optional
+        """
+        object.__setattr__(self, "_features", tuple(features))
+        object.__setattr__(self, "_configuration", tuple(configuration.items()))
+        object.__setattr__(self, "_features_class", features_class)
+        object.__setattr__(self, "_utils", utils)
+        object.__setattr__(self, "_order", tuple(order) if order is not None else tuple(range(len(self._features))))
+        object.__setattr__(self, "_releases", tuple(releases) if releases is not None else ((), ) * len(self._order))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return self.__class__, (
+            self._features,
+            dict(self._configuration),
+            self._features_class,
+            self._utils,
+            self._order,
+            self._releases)
+
+    def __len__(self):
+        return len(self._features)
+
+    def __iter__(self):
+        return iter(self._features)
+
+    def __getitem__(self, item):
+        return self._features[item]
+
+    @property
+    def configuration(self):
+        """Returns the common extractor configuration"""
+        return dict(self._configuration)
+
+    @property
+    def order(self):
+        """Returns the order of the computation (indices of the features)"""
+        return self._order
+
+    @property
+    def releases(self):
+        """Returns the intermediates to release after each step of the computation"""
+        return self._releases
+
+    @classmethod
+    def compile(cls, pipeline, features_class, mapping, fusion, validation, utils, planner=None, **configuration):
+        """
+        Compiles the (prepared) pipeline of the features.
+
+        The feature arguments are fuzed with the common configuration and validated, the feature
+        computation methods are resolved and the labels that do not depend on the data are built.
+        The planner orders the computation of the features and schedules the release of the intermediates.
+
+        :param pipeline: prepared pipeline of the features
+        :type pipeline: list
+        :param features_class: handwriting features class
+        :type features_class: type
+        :param mapping: feature mapper
+        :type mapping: type
+        :param fusion: feature arguments fusion
+        :type fusion: type
+        :param validation: feature validator
+        :type validation: type
+        :param utils: single-subject feature utils
+        :type utils: type
+        :param planner: features planner, defaults to None (the pipeline order, no releases)
+        :type planner: type, optional
+        :param configuration: common extractor configuration
+        :type configuration: **kwargs
+        :return: compiled features pipeline
+        :rtype: CompiledFeaturesPipeline
+        """
+
+        # Prepare the features configuration (the features are not bound to any sample)
+        features = features_class(None, **{key: val for key, val in configuration.items() if key != "validate"})
+
+        # Prepare the compiled features
+        compiled = []
+
+        # Compile the features specified in the features pipeline
+        for feature in pipeline:
+
+            # Get the feature name and args
+            name = feature.get("name")
+            args = dict(feature.get("args", {}))
+
+            # Prepare the feature args (fuze the feature args with the common configuration)
+            args = fusion.fuze(name, args, features.config, features.skip_features)
+
+            # Get the validated feature arguments
+            arguments = validation.validate(name, args)
+
+            # Resolve the feature computation method
+            method = getattr(features_class, mapping.resolve(name))
+
+            # Prepare the labels (the labels of multi-valued features without statistics depend on the data)
+            if args.get("statistics") or not utils.features_settings.is_feature_multivalued(name):
+                labels = tuple(utils.prepare_feature_labels([None], name, args))
+            else:
+                labels = None
+
+            # Add the compiled feature
+            compiled.append(CompiledFeature(name, args, arguments, method, labels))
+
+        # Plan the computation of the features
+        order, releases = planner.plan([feature.name for feature in compiled]) if planner else (None, None)
+
+        # Return the compiled features pipeline
+        return cls(compiled, configuration, features_class, utils, order, releases)
+
+    def execute(self, data_values, data_labels=None):
+        """
+        Executes the compiled pipeline of the features for a single subject.
+
+        :param data_values: sample values to extract the features from
+        :type data_values: numpy.ndarray
+        :param data_labels: labels for data samples, defaults to None
+        :type data_labels: list, optional
+        :return: extracted features and labels
+        :rtype: dict {"features": ..., "labels": ...}
+        """
+
+        # Initialize the handwriting features interface
+        features = self._features_class.from_numpy_array(data_values, data_labels, **self.configuration)
+
+        # Prepare the buffers for extracted feature values/labels
+        feature_values = [None] * len(self._features)
+        feature_labels = [None] * len(self._features)
+
+        # Extract the features specified in the compiled features pipeline (in the planned order)
+        for index, releases in zip(self._order, self._releases):
+            feature = self._features[index]
+
+            # Extract the feature
+            extracted = feature.method(features, **feature.arguments)
+
+            # Update the feature values/labels
+            feature_values[index] = self._utils.prepare_feature_values(extracted)
+            feature_labels[index] = \
+                list(feature.labels) \
+                if feature.labels is not None \
+                else self._utils.prepare_feature_labels(extracted, feature.name, feature.args)
+
+            # Release the intermediates (the last consumers have been computed)
+            for intermediate in releases:
+                features.wrapper.release_intermediate(intermediate)
+
+        # Return the extracted feature values/labels
+        return {
+            "features": feature_values,
+            "labels": feature_labels
+        }
@@ -0,0 +1,103 @@
+import numpy
+from multiprocessing import shared_memory
+
+
+class SharedArray(object):
+    """Class implementing the numpy array backed by the shared memory (transport between processes)"""
+
+    def __init__(self, memory, shape, dtype):
+        """
+        Initializes the shared array object.
+
+        :param memory: shared memory block
+        :type memory: multiprocessing.shared_memory.SharedMemory
+        :param shape: shape of the array
+        :type shape: tuple
+        :param dtype: data type of the array
+        :type dtype: numpy.dtype
+        """
+
+        # Set the shared memory block
+        self.memory = memory
+
+        # Set the array (a view into the shared memory block)
+        self.array = numpy.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+    @classmethod
+    def create(cls, shape, dtype=numpy.float64, fill_value=None):
+        """
+        Creates the shared array.
+
+        :param shape: shape of the array
+        :type shape: tuple
+        :param dtype: data type of the array, defaults to numpy.float64
+        :type dtype: numpy.dtype, optional
+        :param fill_value: value to fill the array with, defaults to None
+        :type fill_value: Any, optional
+        :return: shared array
+        :rtype: SharedArray
+        """
+
+        # Create the shared memory block (it can not be empty)
+        dtype = numpy.dtype(dtype)
+        memory = shared_memory.SharedMemory(create=True, size=max(int(numpy.prod(shape)) * dtype.itemsize, 1))
+
+        # Initialize the shared array
+        shared = cls(memory, shape, dtype)
+
+        # Fill the shared array
+        if fill_value is not None:
+            shared.array.fill(fill_value)
+
+        # Return the shared array
+        return shared
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Creates the shared array from an array (copies the array into the shared memory).
+
+        :param array: array to be shared
+        :type array: numpy.ndarray
+        :return: shared array
+        :rtype: SharedArray
+        """
+
+        # Validate the data type (objects can not be shared)
+        if array.dtype.hasobject:
+            raise ValueError("Arrays of objects can not be shared")
+
+        # Create the shared array and copy the array into it
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+
+        # Return the shared array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attaches to the shared array (e.g. in a worker process).
+
+        :param descriptor: descriptor of the shared array (name, shape, dtype)
+        :type descriptor: tuple
+        :return: shared array
+        :rtype: SharedArray
+        """
+        name, shape, dtype = descriptor
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype)
+
+    @property
+    def descriptor(self):
+        """Returns the descriptor of the shared array (name, shape, dtype)"""
+        return self.memory.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        """Closes the access to the shared array"""
+        self.array = None
+        self.memory.close()
+
+    def unlink(self):
+        """Closes and destroys the shared array"""
+        self.close()
+        self.memory.unlink()
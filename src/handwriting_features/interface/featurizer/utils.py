@@ -105,6 +105,30 @@ class SingleSubjectFeatureUtils(object):
         # Return the prepared feature labels
         return labels
 
+    @classmethod
+    def finalize_feature_values(cls, extracted):
+        """
+        Finalizes the feature values (concatenates the values of the features).
+
+        :param extracted: extracted features
+        :type extracted: dict {"features": ..., "labels": ...}
+        :return: finalized feature values
+        :rtype: numpy.ndarray
+        """
+        return numpy.hstack(extracted["features"]) if extracted["features"] else numpy.array([])
+
+    @classmethod
+    def finalize_feature_labels(cls, extracted):
+        """
+        Finalizes the feature labels (concatenates the labels of the features).
+
+        :param extracted: extracted features
+        :type extracted: dict {"features": ..., "labels": ...}
+        :return: finalized feature labels
+        :rtype: list
+        """
+        return list(chain.from_iterable(extracted["labels"]))
+
 
 class MultiSubjectFeatureUtils(object):
     """Class implementing multi-subject feature values/labels utils"""
@@ -0,0 +1,16 @@
+import pathlib
+import pytest
+from handwriting_features.features import HandwritingFeatures
+
+
+# Example samples
+examples = sorted((pathlib.Path(__file__).parents[1] / "examples" / "data").glob("*/*.svc"))
+
+# Variables of the example samples
+variables = ["y", "x", "time", "pen_status", "azimuth", "tilt", "pressure"]
+
+
+@pytest.fixture
+def features():
+    """Returns the handwriting features of the first example sample"""
+    return HandwritingFeatures.from_svc(str(examples[0]), variables, fs=133)
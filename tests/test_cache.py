@@ -0,0 +1,83 @@
+import gc
+import weakref
+import numpy
+import pytest
+from handwriting_features.data.utils.cache import DerivedVariablesCache, read_only
+from handwriting_features.features import HandwritingFeatures
+from conftest import examples, variables
+
+
+def test_sample_wrapper_is_released_without_garbage_collection():
+    gc.disable()
+    try:
+        features = HandwritingFeatures.from_svc(str(examples[0]), variables, fs=133)
+        features.number_of_intra_stroke_intersections()
+        features.vertical_peaks_velocity(fs=133)
+        features.relative_number_of_changes_in_velocity_profile(fs=133)
+        wrapper = weakref.ref(features.wrapper)
+        del features
+        assert wrapper() is None
+    finally:
+        gc.enable()
+
+
+def test_read_only_views_leave_the_original_arrays_writeable():
+    values = numpy.arange(3.0)
+    variable = read_only((values, [values], {"values": values}))
+    assert values.flags.writeable
+    assert not any(view.flags.writeable for view in (variable[0], variable[1][0], variable[2]["values"]))
+    with pytest.raises(ValueError):
+        variable[0] *= 0
+    numpy.testing.assert_array_equal(values, [0.0, 1.0, 2.0])
+
+
+def test_cached_variables_are_read_only_and_features_are_writeable(features):
+    velocity = features.velocity()
+    velocity *= 0
+    assert not features.wrapper.compute_velocity().flags.writeable
+    assert features.wrapper.sample.x.flags.writeable
+    assert features.wrapper.on_surface_data.x.flags.writeable
+    assert numpy.all(features.velocity() == features.wrapper.compute_velocity())
+    assert numpy.any(features.velocity() != 0)
+
+
+def test_shared_intermediate_results_can_not_be_modified(features):
+    durations = features.writing_duration()
+    with pytest.raises(ValueError):
+        features.wrapper.get_intermediate(("stroke_durations", False), lambda: None)[...] = 0
+    numpy.testing.assert_array_equal(features.writing_duration(), durations)
+
+
+def test_derived_variables_cache_evicts_least_recently_used_variables():
+    cache = DerivedVariablesCache(maxsize=2)
+    cache.get(("a", 1), lambda: 1)
+    cache.get(("b", 1), lambda: 2)
+    cache.get(("a", 1), lambda: None)
+    cache.get(("c", 1), lambda: 3)
+
+    assert list(cache.variables) == [("a", 1), ("c", 1)]
+    assert cache.info() == {"hits": 1, "misses": 3, "maxsize": 2, "size": 2}
+
+    cache.evict("a")
+    assert list(cache.variables) == [("c", 1)]
+
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "maxsize": 2, "size": 0}
+
+
+def test_cached_variables_are_keyed_by_bound_arguments(features):
+    cache = features.wrapper.variables_cache
+    velocity = features.wrapper.compute_velocity("x")
+
+    assert features.wrapper.compute_velocity(axis="x") is velocity
+    assert features.wrapper.compute_velocity("x", False) is velocity
+    assert ("compute_velocity", "x", False) in cache.variables
+    assert features.wrapper.compute_velocity("y") is not velocity
+
+
+def test_cached_variables_are_not_shared_by_sample_wrappers(features):
+    other = HandwritingFeatures.from_svc(str(examples[1]), variables, fs=133)
+    velocity = features.wrapper.compute_velocity()
+
+    assert other.wrapper.compute_velocity() is not velocity
+    assert other.wrapper.variables_cache is not features.wrapper.variables_cache
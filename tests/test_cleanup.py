@@ -0,0 +1,31 @@
+import numpy
+import pandas
+import pytest
+from handwriting_features.data.utils.cleanup import rolling_median, remove_outliers
+
+
+def _random_data(size, seed):
+    """Returns the random data with ties, NaN and Inf values"""
+    rng = numpy.random.default_rng(seed)
+    data = rng.integers(-5, 20, size).astype(float)
+    data[rng.integers(0, size, size // 10)] = numpy.nan
+    data[rng.integers(0, size, size // 50)] = numpy.inf
+    return data
+
+
+@pytest.mark.parametrize("window_size", [1, 2, 3, 4, 7, 32, 33, 64])
+@pytest.mark.parametrize("center", [False, True])
+def test_rolling_median_equals_pandas(window_size, center):
+    data = _random_data(500, window_size)
+    for min_samples in sorted({1, min(3, window_size), window_size}):
+        expected = pandas.Series(data).rolling(window=window_size, min_periods=min_samples, center=center).median()
+        numpy.testing.assert_array_equal(rolling_median(data, window_size, min_samples, center), expected.values)
+
+
+def test_remove_outliers_equals_baseline():
+    for seed, window_size in enumerate([5, 30, 50]):
+        data = numpy.abs(_random_data(300, seed)) + 1
+        medians = pandas.Series(data).rolling(window=window_size, min_periods=3, center=True).median().values
+        expected = numpy.array([e for e, m in zip(data, medians) if numpy.abs(e) < 3 * numpy.abs(m)])
+        expected = expected[numpy.isfinite(expected)]
+        numpy.testing.assert_array_equal(remove_outliers(data, window_size), expected)
@@ -0,0 +1,69 @@
+import numpy
+import pytest
+import scipy.signal as sc
+from handwriting_features.data.exceptions.dsp import FiltrationError
+from handwriting_features.data.utils.math import derivation
+from handwriting_features.features import HandwritingFeatures
+from conftest import examples, variables
+
+
+def _gaussian_filter(signal, n_window=50, sigma=10):
+    """Filters an input signal by a Gaussian filter (the reference)"""
+    window = sc.windows.gaussian(n_window, std=sigma)
+    try:
+        return sc.filtfilt(window / numpy.sum(window), 1, signal)
+    except ValueError as e:
+        raise FiltrationError(f"_custom_gaussian_filter filtration failed due to {e}")
+
+
+def _changes(signal):
+    """Gets the number of the local extrema of an input signal (the reference)"""
+    return numpy.sum((signal[1:-1] > signal[:-2]) & (signal[1:-1] > signal[2:])) + \
+        numpy.sum((signal[1:-1] < signal[:-2]) & (signal[1:-1] < signal[2:]))
+
+
+def _number_of_changes(wrapper, channel):
+    """Computes the number of changes stroke by stroke (the reference)"""
+    if channel != "velocity":
+        return sum(_changes(_gaussian_filter(getattr(stroke, channel))) for stroke in wrapper.on_surface_strokes)
+
+    # Skip the strokes too short to filter their velocity
+    num_changes = 0
+    for stroke in wrapper.on_surface_strokes:
+        velocity = numpy.sqrt(derivation(stroke.x) ** 2 + derivation(stroke.y) ** 2) / derivation(stroke.time)
+        try:
+            num_changes += _changes(_gaussian_filter(velocity))
+        except FiltrationError:
+            continue
+    return num_changes
+
+
+def _truncated(features, num_samples):
+    """Returns the handwriting features of the first <num_samples> samples"""
+    data = numpy.vstack([getattr(features.wrapper.sample, variable)[:num_samples] for variable in variables]).T
+    return HandwritingFeatures.from_numpy_array(data, variables, fs=133)
+
+
+@pytest.mark.parametrize("name", ["number_of_changes_in_x_profile", "number_of_changes_in_velocity_profile"])
+def test_number_of_changes_of_too_short_sample_raises_filtration_error(features, name):
+    with pytest.raises(FiltrationError):
+        getattr(_truncated(features, 33), name)(fs=133)
+
+
+def test_number_of_changes_of_long_enough_sample_is_computed(features):
+    numpy.testing.assert_array_equal(_truncated(features, 34).number_of_changes_in_velocity_profile(fs=133), [0])
+
+
+@pytest.mark.parametrize("example", examples[:8], ids=lambda path: path.stem)
+@pytest.mark.parametrize("channel", ["x", "y", "azimuth", "tilt", "pressure", "velocity"])
+def test_number_of_changes_equal_stroke_by_stroke_number_of_changes(example, channel):
+    features = HandwritingFeatures.from_svc(str(example), variables, fs=133)
+    name = f"number_of_changes_in_{channel}" + ("_profile" if channel in ("x", "y", "velocity") else "")
+
+    try:
+        expected = _number_of_changes(features.wrapper, channel)
+    except FiltrationError:
+        with pytest.raises(FiltrationError):
+            getattr(features, name)(fs=133)
+    else:
+        numpy.testing.assert_array_equal(getattr(features, name)(fs=133), [expected])
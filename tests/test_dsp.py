@@ -0,0 +1,136 @@
+import numpy
+import pytest
+import scipy.signal as sc
+from handwriting_features.data.utils.dsp import design_filter, LowPassFilter, GaussianFilter, fft_filtfilt
+from handwriting_features.data.utils.dsp import filtfilt_padded
+from handwriting_features.data.utils.dsp import segment, segment_channels
+from handwriting_features.data.exceptions.dsp import FiltrationError
+
+
+def _random_signal(size, seed):
+    """Returns the random walk signal"""
+    return numpy.cumsum(numpy.random.default_rng(seed).standard_normal(size))
+
+
+def _segment(signal, window_size, window_step):
+    """Segments an input signal window by window (the reference)"""
+    x_padded = numpy.hstack((signal, numpy.zeros((window_size - len(signal) % window_size))))
+    num_windows = (len(x_padded) - window_size) // window_step
+    segmented = numpy.ndarray((num_windows, window_size), dtype=x_padded.dtype)
+    for i in numpy.arange(num_windows):
+        segmented[i] = x_padded[(i * window_step):(i * window_step + window_size)]
+    return segmented
+
+
+@pytest.mark.parametrize("size", [0, 1, 7, 8, 9, 100, 101])
+@pytest.mark.parametrize("window_size, window_step", [(2, 1), (8, 1), (8, 3), (8, 8), (8, 20), (64, 4)])
+def test_segment_equals_window_by_window_segmentation(size, window_size, window_step):
+    for signal in (_random_signal(size, size), numpy.arange(size)):
+        segmented = segment(signal, window_size, window_step)
+        expected = _segment(signal, window_size, window_step)
+
+        assert segmented.dtype == expected.dtype
+        numpy.testing.assert_array_equal(segmented, expected)
+
+
+def test_segment_is_read_only_view():
+    signal = _random_signal(100, 0)
+    segmented = segment(signal, 8, 8)
+
+    assert numpy.shares_memory(segmented, signal)
+    assert not segmented.flags.writeable
+
+
+def test_segment_of_odd_window_size_raises_value_error():
+    with pytest.raises(ValueError):
+        segment(_random_signal(100, 0), 7, 1)
+
+
+def test_segment_channels_equals_segmented_channels():
+    signals = numpy.stack([_random_signal(100, seed) for seed in range(3)])
+    segmented = segment_channels(signals, 8, 3)
+
+    for channel, signal in zip(segmented, signals):
+        numpy.testing.assert_array_equal(channel, segment(signal, 8, 3))
+
+
+def test_design_filter_is_cached_and_read_only():
+    coefficients = design_filter("butter", 10, 133, 17)
+
+    assert design_filter("butter", 10, 133, 17) is coefficients
+    assert not any(array.flags.writeable for array in coefficients)
+    with pytest.raises(ValueError):
+        design_filter("chebyshev", 10, 133, 17)
+
+
+def test_design_filter_equals_scipy_design():
+    for expected, designed in zip(sc.butter(10, 17 / (0.5 * 133), btype="lowpass", output="ba"),
+                                  design_filter("butter", 10, 133, 17)):
+        numpy.testing.assert_array_equal(designed, expected)
+
+    window = sc.windows.gaussian(50, std=10)
+    numpy.testing.assert_array_equal(design_filter("gaussian", 10, n=50)[0], window / numpy.sum(window))
+
+
+@pytest.mark.parametrize("signal_filter", [LowPassFilter(133, 17), GaussianFilter(133, 50, method="direct")],
+                         ids=["low_pass", "gaussian"])
+def test_filter_channels_equals_filtered_channels(signal_filter):
+    signals = numpy.stack([_random_signal(500, seed) for seed in range(5)])
+    filtered = signal_filter.filter_channels(signals)
+
+    for channel, signal in zip(filtered, signals):
+        numpy.testing.assert_allclose(channel, signal_filter.filter(signal), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("size", [151, 1000, 20000])
+@pytest.mark.parametrize("n", [5, 50])
+def test_fft_filtfilt_equals_scipy_filtfilt(size, n):
+    b, _ = design_filter("gaussian", 10, n=n)
+    signals = numpy.stack([_random_signal(size, seed) for seed in range(2)])
+
+    numpy.testing.assert_allclose(fft_filtfilt(b, signals), sc.filtfilt(b, 1, signals), rtol=1e-9, atol=1e-9)
+    numpy.testing.assert_allclose(fft_filtfilt(b, signals[0]), sc.filtfilt(b, 1, signals[0]), rtol=1e-9, atol=1e-9)
+
+
+def test_gaussian_filter_methods_are_equivalent():
+    signal = _random_signal(5000, 0)
+    direct = GaussianFilter(133, 50, method="direct").filter(signal)
+
+    numpy.testing.assert_allclose(GaussianFilter(133, 50, method="fft").filter(signal), direct, rtol=1e-9, atol=1e-9)
+    numpy.testing.assert_allclose(GaussianFilter(133, 50).filter(signal), direct, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("method", GaussianFilter.methods)
+def test_gaussian_filter_of_too_short_signal_raises_filtration_error(method):
+    with pytest.raises(FiltrationError):
+        GaussianFilter(133, 50, method=method).filter(_random_signal(150, 0))
+
+
+@pytest.mark.parametrize("design", [("gaussian", 10, None, None, 50), ("butter", 10, 133, 17, None)],
+                         ids=["gaussian", "butter"])
+def test_filtfilt_padded_equals_scipy_filtfilt(design):
+    b, a = design_filter(*design)
+    signals = [_random_signal(size, size) for size in (151, 500, 152, 1000)]
+    filtered = filtfilt_padded(b, a, signals)
+
+    assert filtered.shape == (len(signals), 1000)
+    for row, signal in zip(filtered, signals):
+        numpy.testing.assert_allclose(row[:signal.size], sc.filtfilt(b, a, signal), rtol=1e-9, atol=1e-9)
+        assert numpy.isnan(row[signal.size:]).all()
+
+
+def test_filtfilt_padded_of_too_short_signal_raises_value_error():
+    b, a = design_filter("gaussian", 10, n=50)
+    with pytest.raises(ValueError):
+        filtfilt_padded(b, a, [_random_signal(500, 0), _random_signal(150, 1)])
+
+
+@pytest.mark.parametrize("method", [None, *GaussianFilter.methods])
+def test_filter_padded_equals_filtered_signals(method):
+    signal_filter = GaussianFilter(133, 50, method=method)
+    signals = [_random_signal(size, size) for size in (151, 500, 152)]
+    filtered, lengths = signal_filter.filter_padded(signals)
+
+    numpy.testing.assert_array_equal(lengths, [151, 500, 152])
+    for row, signal in zip(filtered, signals):
+        numpy.testing.assert_allclose(row[:signal.size], signal_filter.filter(signal), rtol=1e-9, atol=1e-9)
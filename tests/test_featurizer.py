@@ -0,0 +1,83 @@
+import numpy
+import pytest
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.interface.featurizer.handlers import MultiSubjectFeatureExtractorHandler
+from handwriting_features.interface.featurizer.handlers import SingleSubjectFeatureExtractorHandler
+from conftest import examples, variables
+
+
+# Pipeline of the features (features of fixed and variable length, with and without statistics)
+pipeline = [
+    {"name": "velocity", "args": {"axis": ["x", "y"], "statistics": ["mean", "median"]}},
+    {"name": "stroke_length", "args": {"in_air": [False, True], "statistics": ["mean"]}},
+    {"name": "vertical_peaks_indices"},
+    {"name": "number_of_inter_stroke_intersections"},
+    {"name": "writing_stops", "args": {"statistics": ["mean", "slope_of_linear_regression"]}}
+]
+
+# Configuration of the extraction
+configuration = {"fs": 133, "logging_settings": {"soft_validation": True}}
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Returns the data of the first four example samples (subjects, samples, variables)"""
+    samples = [HandwritingFeatures.from_svc(str(example), variables).wrapper.sample for example in examples[:4]]
+    values = [numpy.vstack([getattr(sample, variable) for variable in variables]).T for sample in samples]
+    return numpy.stack([value[:min(len(v) for v in values)] for value in values])
+
+
+def _assert_same_extraction(extracted, expected):
+    """Asserts the extractions are the same (including the data types of the elements)"""
+    assert extracted["features"].dtype == expected["features"].dtype
+    assert [type(value) for value in extracted["features"].ravel().tolist()] == \
+        [type(value) for value in expected["features"].ravel().tolist()]
+    numpy.testing.assert_array_equal(extracted["features"], expected["features"])
+    assert extracted["labels"] == expected["labels"]
+
+
+@pytest.mark.parametrize("executor, transport", [
+    ("serial", None), ("thread", None), ("process", None), ("process", "shared_memory")
+])
+def test_executors_extract_the_same_features(data, executor, transport):
+    expected = MultiSubjectFeatureExtractorHandler.extract(data, variables, pipeline, **configuration)
+    extracted = MultiSubjectFeatureExtractorHandler.extract(
+        data, variables, pipeline, executor=executor, n_jobs=2, chunk_size=2, transport=transport, **configuration)
+
+    _assert_same_extraction(extracted, expected)
+    assert extracted.keys() == expected.keys() == {"features", "labels", "failures"}
+    assert extracted["failures"] == expected["failures"] == {}
+
+
+@pytest.mark.parametrize("executor, transport", [("serial", None), ("process", "shared_memory")])
+def test_executors_report_failures_of_the_subjects(data, executor, transport):
+    failing = data.copy()
+    failing[1, :, variables.index("pen_status")] = 0
+
+    extracted = MultiSubjectFeatureExtractorHandler.extract(
+        failing, variables, pipeline, executor=executor, n_jobs=2, transport=transport, **configuration)
+    expected = MultiSubjectFeatureExtractorHandler.extract(data[[0, 2, 3]], variables, pipeline, **configuration)
+
+    assert list(extracted["failures"]) == [1]
+    assert numpy.isnan(extracted["features"][1]).all()
+    numpy.testing.assert_array_equal(extracted["features"][[0, 2, 3]], expected["features"])
+
+
+def test_extraction_without_executor_raises_failures(data):
+    failing = data.copy()
+    failing[1, :, variables.index("pen_status")] = 0
+
+    with pytest.raises(IndexError):
+        MultiSubjectFeatureExtractorHandler.extract(failing, variables, pipeline, **configuration)
+
+
+def test_iter_extract_equals_single_subject_extraction(data):
+    subjects = MultiSubjectFeatureExtractorHandler.iter_extract(
+        (values for values in data), variables, pipeline, **configuration)
+
+    for (subject, values, labels), expected in zip(subjects, data):
+        expected = SingleSubjectFeatureExtractorHandler.extract(expected, variables, pipeline, **configuration)
+
+        numpy.testing.assert_array_equal(values, numpy.hstack(expected["features"]))
+        assert labels == [label for feature_labels in expected["labels"] for label in feature_labels]
+    assert subject == len(data) - 1
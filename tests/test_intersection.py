@@ -0,0 +1,82 @@
+import numpy
+import pytest
+from handwriting_features.data.containers.sample import HandwritingSampleWrapper
+from handwriting_features.data.utils.math import intersection, _get_candidate_segment_pairs
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.features.implementation.conventional.utils.spatial import IntersectionUtils
+from conftest import examples, variables
+
+
+# Intersection features (sharing the intersection utils of the sample)
+intersection_features = [
+    "number_of_intra_stroke_intersections",
+    "relative_number_of_intra_stroke_intersections",
+    "total_number_of_intra_stroke_intersections",
+    "relative_total_number_of_intra_stroke_intersections",
+    "number_of_inter_stroke_intersections",
+    "relative_number_of_inter_stroke_intersections"
+]
+
+
+def _stationary_pen_curve():
+    """Returns a curve with a stationary-pen run (3000 identical points) followed by a random walk"""
+    walk = numpy.random.default_rng(0).standard_normal((2, 50)).cumsum(axis=1)
+    return numpy.concatenate([numpy.full(3000, 5.0), walk[0]]), numpy.concatenate([numpy.full(3000, 5.0), walk[1]])
+
+
+def test_grid_intersection_of_stationary_pen_equals_dense():
+    x, y = _stationary_pen_curve()
+    numpy.testing.assert_array_equal(intersection(x, y, method="grid"), intersection(x, y, method="dense"))
+
+
+def test_grid_candidates_of_stationary_pen_are_not_quadratic():
+    x, y = _stationary_pen_curve()
+    i, _ = _get_candidate_segment_pairs(x, y, x, y, False)
+    assert i.size < 50 ** 2
+
+
+def test_grid_intersection_with_block_size_equals_dense():
+    x, y = numpy.random.default_rng(1).standard_normal((2, 500)).cumsum(axis=1)
+    dense = intersection(x, y, method="dense")
+    for block_size in (4, 32):
+        numpy.testing.assert_array_equal(intersection(x, y, method="grid", block_size=block_size), dense)
+
+
+def test_statistics_are_the_first_positional_argument_of_intersection_features(features):
+    numpy.testing.assert_array_equal(
+        features.number_of_intra_stroke_intersections(("mean", )),
+        features.number_of_intra_stroke_intersections(statistics=("mean", ), block_size=16))
+
+
+@pytest.mark.parametrize("example", [examples[i] for i in (0, 1, 35, 36, 60, 64)], ids=lambda path: path.stem)
+def test_inter_stroke_intersections_of_overlapping_strokes_equal_all_intersections(example):
+    wrapper = HandwritingSampleWrapper.from_svc(str(example), variables)
+    strokes = wrapper.on_surface_strokes
+
+    # Get the intersections of the strokes concatenated (separated by NaNs) without the intra-stroke ones
+    intra = {(x, y) for stroke in strokes for x, y in intersection(stroke.x, stroke.y) if x is not None}
+    x = numpy.concatenate([numpy.append(numpy.asarray(stroke.x, dtype=float), numpy.nan) for stroke in strokes])
+    y = numpy.concatenate([numpy.append(numpy.asarray(stroke.y, dtype=float), numpy.nan) for stroke in strokes])
+    inter = [(i, j) for i, j in intersection(x, y, method="dense") if i is not None and (i, j) not in intra]
+
+    assert IntersectionUtils(wrapper).get_number_of_inter_stroke_intersections() == len(inter)
+
+
+def test_intersection_features_share_the_intersection_utils(monkeypatch):
+    example = str(examples[35])
+    expected = [getattr(HandwritingFeatures.from_svc(example, variables), name)() for name in intersection_features]
+
+    # Count the computations of the intersection utils
+    computations = []
+    init = IntersectionUtils.__init__
+
+    def counted_init(self, *args, **kwargs):
+        computations.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(IntersectionUtils, "__init__", counted_init)
+
+    features = HandwritingFeatures.from_svc(example, variables)
+    for name, values in zip(intersection_features, expected):
+        numpy.testing.assert_array_equal(getattr(features, name)(), values)
+    assert len(computations) == 1
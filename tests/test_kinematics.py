@@ -0,0 +1,47 @@
+import numpy
+import pytest
+from handwriting_features.data.containers.sample import HandwritingSampleWrapper
+from handwriting_features.data.utils.math import derivation
+from conftest import examples, variables
+
+
+def _strokes_kinematics(wrapper, axis, in_air):
+    """Computes the velocity, acceleration and jerk stroke by stroke (the reference)"""
+
+    # Get the strokes
+    strokes = wrapper.in_air_strokes if in_air else wrapper.on_surface_strokes
+
+    # Compute the kinematics of the strokes
+    velocity, acceleration, jerk = [], [], []
+    for stroke in strokes:
+        dx, dy, dt = derivation(stroke.x), derivation(stroke.y), derivation(stroke.time)
+        ds = {"x": numpy.abs(dx), "y": numpy.abs(dy), "xy": numpy.sqrt(dx ** 2 + dy ** 2)}[axis]
+        velocity.append(ds / dt)
+        acceleration.append(derivation(velocity[-1]) / dt[1:])
+        jerk.append(derivation(acceleration[-1]) / dt[2:])
+
+    # Return the concatenated kinematics
+    return tuple(numpy.concatenate(variable) for variable in (velocity, acceleration, jerk))
+
+
+@pytest.mark.parametrize("example", examples[:3], ids=lambda path: path.stem)
+@pytest.mark.parametrize("axis", HandwritingSampleWrapper.axes)
+@pytest.mark.parametrize("in_air", [False, True])
+def test_kinematics_equal_to_stroke_by_stroke_kinematics(example, axis, in_air):
+    wrapper = HandwritingSampleWrapper.from_svc(str(example), variables)
+    expected = _strokes_kinematics(wrapper, axis, in_air)
+
+    for name, values in zip(("velocity", "acceleration", "jerk"), expected):
+        numpy.testing.assert_allclose(getattr(wrapper, f"compute_{name}")(axis, in_air), values, rtol=1e-12)
+
+
+@pytest.mark.parametrize("name", ["velocity", "acceleration", "jerk"])
+def test_in_air_kinematics_without_in_air_strokes_raise_value_error(name):
+    sample = HandwritingSampleWrapper.from_svc(str(examples[0]), variables).sample
+    data = numpy.vstack([getattr(sample, variable) for variable in variables]).T
+    data[:, variables.index("pen_status")] = 1
+    wrapper = HandwritingSampleWrapper.from_numpy_array(data, variables)
+
+    assert wrapper.compute_velocity("xy", False).size > 0
+    with pytest.raises(ValueError):
+        getattr(wrapper, f"compute_{name}")("xy", True)
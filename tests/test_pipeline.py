@@ -0,0 +1,66 @@
+import pickle
+import numpy
+import pytest
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.interface.featurizer.handlers import SingleSubjectFeatureExtractorHandler
+from handwriting_features.interface.featurizer.pipeline import CompiledFeaturesPipeline
+from conftest import examples, variables
+
+
+# Pipeline of the features (features of fixed and variable length, with and without statistics)
+pipeline = [
+    {"name": "velocity", "args": {"axis": ["x", "y"], "statistics": ["mean", "median"]}},
+    {"name": "stroke_length", "args": {"in_air": [False, True]}},
+    {"name": "acceleration", "args": {"statistics": ["slope_of_linear_regression"]}},
+    {"name": "writing_stops", "args": {"statistics": ["mean"]}},
+    {"name": "number_of_inter_stroke_intersections"}
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Returns the data of an example sample (samples, variables)"""
+    sample = HandwritingFeatures.from_svc(str(examples[3]), variables).wrapper.sample
+    return numpy.vstack([getattr(sample, variable) for variable in variables]).T
+
+
+@pytest.fixture
+def compiled():
+    """Returns the compiled pipeline of the features"""
+    return SingleSubjectFeatureExtractorHandler.compile_pipeline(pipeline, fs=133)
+
+
+def _assert_same_extraction(extracted, expected):
+    """Asserts the extractions are the same"""
+    assert extracted["labels"] == expected["labels"]
+    for values, expected_values in zip(extracted["features"], expected["features"]):
+        numpy.testing.assert_array_equal(values, expected_values)
+
+
+def test_compiled_pipeline_is_immutable(compiled):
+    with pytest.raises(AttributeError):
+        compiled.order = ()
+    with pytest.raises(AttributeError):
+        compiled._features = ()
+    with pytest.raises(AttributeError):
+        compiled[0].args = {}
+
+    compiled.configuration["fs"] = 0
+    assert compiled.configuration["fs"] == 133
+
+
+def test_compiled_pipeline_extracts_the_same_features_as_pipeline(data, compiled):
+    expected = SingleSubjectFeatureExtractorHandler.extract(data, variables, pipeline, fs=133)
+
+    _assert_same_extraction(SingleSubjectFeatureExtractorHandler.extract(data, variables, compiled), expected)
+    _assert_same_extraction(SingleSubjectFeatureExtractorHandler.extract(data, variables, compiled), expected)
+
+
+def test_compiled_pipeline_is_picklable(data, compiled):
+    loaded = pickle.loads(pickle.dumps(compiled))
+
+    assert isinstance(loaded, CompiledFeaturesPipeline)
+    assert [feature.name for feature in loaded] == [feature.name for feature in compiled]
+    assert loaded.configuration == compiled.configuration
+    assert loaded.order == compiled.order and loaded.releases == compiled.releases
+    _assert_same_extraction(loaded.execute(data, variables), compiled.execute(data, variables))
@@ -0,0 +1,91 @@
+import functools
+import numpy
+import pytest
+from handwriting_features.data.containers.sample import HandwritingSampleWrapper
+from handwriting_features.data.utils.cache import DerivedVariablesCache
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.features.configuration.settings import HandwritingFeaturesSettings
+from handwriting_features.features.configuration.planner import HandwritingFeaturesPlanner
+from handwriting_features.interface.featurizer.handlers import SingleSubjectFeatureExtractorHandler
+from conftest import examples, variables
+
+
+# Example sample (all features can be computed)
+example = str(examples[3])
+
+# Cached data of the sample wrapper
+cached_data = [
+    name for name, value in vars(HandwritingSampleWrapper).items() if isinstance(value, functools.cached_property)
+]
+
+
+def _get_intermediates(wrapper):
+    """Returns the names of the intermediates held by the sample wrapper"""
+    keys = list(wrapper.intermediates) + list(wrapper.variables_cache.variables)
+    names = {key[0] if isinstance(key, tuple) else key for key in keys}
+    return names | {name for name in cached_data if name in wrapper.__dict__}
+
+
+@pytest.mark.parametrize("name", list(HandwritingFeaturesSettings.settings))
+def test_intermediates_of_the_features_are_declared(name):
+    arguments = HandwritingFeaturesSettings.get_feature_arguments(name)
+    declared = set(HandwritingFeaturesSettings.get_feature_intermediates(name))
+
+    for in_air in ((False, True) if "in_air" in arguments else (None, )):
+        features = HandwritingFeatures.from_svc(example, variables, fs=133)
+        kwargs = {"fs": 133} if "fs" in arguments else {}
+        kwargs.update({"in_air": in_air} if in_air is not None else {})
+        getattr(features, name)(**kwargs)
+        assert _get_intermediates(features.wrapper) <= declared
+
+
+def test_planner_releases_the_intermediates_after_their_last_consumer():
+    order, releases = HandwritingFeaturesPlanner.plan(["velocity", "stroke_length", "acceleration", "writing_stops"])
+
+    # The features sharing the intermediates are computed one after another (fewer intermediates first)
+    assert order == (3, 0, 2, 1)
+
+    # The intermediates are released after their last consumer (the dependent intermediates first)
+    assert releases == (
+        (),
+        ("compute_velocity", ),
+        ("compute_acceleration", "_compute_kinematics_buffer", "compute_strokes_increments"),
+        ("stroke_lengths", "in_air_strokes", "on_surface_strokes"))
+
+
+def test_pipeline_computes_each_intermediate_once_and_releases_it(monkeypatch):
+    computations, wrappers = [], []
+
+    # Count the computations of the intermediate results, the cached variables and the cached data
+    get_intermediate = HandwritingSampleWrapper.get_intermediate
+    get_variable = DerivedVariablesCache.get
+
+    def count_intermediate(self, key, compute):
+        wrappers.append(self)
+        return get_intermediate(self, key, lambda: computations.append(key) or compute())
+
+    def count_variable(self, key, compute):
+        return get_variable(self, key, lambda: computations.append(key) or compute())
+
+    def count_data(name, compute):
+        def counted(self):
+            computations.append(name)
+            return compute(self)
+        data = functools.cached_property(counted)
+        data.__set_name__(HandwritingSampleWrapper, name)
+        return data
+
+    monkeypatch.setattr(HandwritingSampleWrapper, "get_intermediate", count_intermediate)
+    monkeypatch.setattr(DerivedVariablesCache, "get", count_variable)
+    for name in cached_data:
+        monkeypatch.setattr(HandwritingSampleWrapper, name, count_data(name, vars(HandwritingSampleWrapper)[name].func))
+
+    # Extract all features of the sample
+    sample = HandwritingFeatures.from_svc(example, variables).wrapper.sample
+    data = numpy.vstack([getattr(sample, variable) for variable in variables]).T
+    pipeline = [{"name": name} for name in HandwritingFeaturesSettings.settings]
+    SingleSubjectFeatureExtractorHandler.extract(data, variables, pipeline, fs=133)
+
+    # Each intermediate is computed once and released at the end
+    assert len(computations) == len(set(computations))
+    assert _get_intermediates(wrappers[-1]) == set()
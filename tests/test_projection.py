@@ -0,0 +1,43 @@
+import numpy
+import pytest
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.features.implementation.conventional.utils.spatial import ProjectionUtils
+from conftest import examples, variables
+
+
+# Vertical features (sharing the projection utils of the sample)
+vertical_features = [
+    f"vertical_{extrema}_{variable}"
+    for variable in ("indices", "values", "velocity", "distance", "duration")
+    for extrema in ("peaks", "valleys")
+]
+
+
+@pytest.mark.parametrize("example", examples[:3], ids=lambda path: path.stem)
+def test_vertical_features_share_the_projection_utils(monkeypatch, example):
+    expected = [
+        getattr(HandwritingFeatures.from_svc(str(example), variables), name)(fs=133) for name in vertical_features
+    ]
+
+    # Count the computations of the projection utils
+    computations = []
+    init = ProjectionUtils.__init__
+
+    def counted_init(self, *args, **kwargs):
+        computations.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(ProjectionUtils, "__init__", counted_init)
+
+    features = HandwritingFeatures.from_svc(str(example), variables)
+    for name, values in zip(vertical_features, expected):
+        numpy.testing.assert_array_equal(getattr(features, name)(fs=133), values)
+    assert len(computations) == 1
+
+
+def test_projection_utils_are_not_shared_by_sampling_frequencies():
+    features = HandwritingFeatures.from_svc(str(examples[0]), variables)
+    features.vertical_peaks_indices(fs=133)
+    features.vertical_peaks_indices(fs=200)
+
+    assert len([key for key in features.wrapper.intermediates if key[0] == ProjectionUtils.__name__]) == 2
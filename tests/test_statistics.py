@@ -0,0 +1,49 @@
+import numpy
+import pytest
+from handwriting_features.data.descriptors.statistics import Statistics, SlopeOfLinearRegression
+from handwriting_features.data.utils.cleanup import remove_outliers
+
+
+def _random_walk(size, seed):
+    """Returns the random walk with outliers and NaN values"""
+    rng = numpy.random.default_rng(seed)
+    data = numpy.cumsum(rng.standard_normal(size)) + 100 + (rng.uniform(size=size) < 0.05) * 50
+    data[rng.uniform(size=size) < 0.1] = numpy.nan
+    return data
+
+
+def _polyfit_slope(array, window_size=5):
+    """Computes the slope of linear regression by fitting the regression curve (the reference)"""
+    data = array[numpy.isfinite(array)]
+    if data.size > window_size:
+        data = remove_outliers(data, window_size)
+    return numpy.polyfit(numpy.arange(data.size), data, 1)[0] if data.size > 1 else numpy.nan
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 5, 6, 7, 30, 1000, 70000])
+def test_slope_of_linear_regression_equals_polyfit(size):
+    data = _random_walk(size, size)
+    numpy.testing.assert_allclose(Statistics.compute(data, "slope_of_linear_regression"), _polyfit_slope(data),
+                                  rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("size", [1, 6, 30, 1000])
+@pytest.mark.parametrize("num_chunks", [2, 3, 7, 64])
+def test_slope_of_linear_regression_of_chunks_equals_single_chunk(size, num_chunks):
+    data = _random_walk(size, size)
+    expected = SlopeOfLinearRegression().update(data).finish()
+
+    statistic = SlopeOfLinearRegression()
+    for chunk in numpy.array_split(data, num_chunks):
+        statistic.update(chunk)
+
+    numpy.testing.assert_allclose(statistic.finish(), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("data", [
+    _random_walk(100, 0), numpy.array([]), numpy.array([numpy.nan, numpy.nan]), numpy.array([1.0]), numpy.nan
+], ids=["walk", "empty", "nan", "single", "scalar"])
+def test_compute_many_equals_compute(data):
+    names = list(Statistics.mapping)
+    expected = [Statistics.compute(data, name) for name in names]
+    numpy.testing.assert_array_equal(Statistics.compute_many(data, names), expected)
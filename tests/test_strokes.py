@@ -0,0 +1,81 @@
+import numpy
+import pytest
+from handwriting_features.data.containers.sample import HandwritingSampleWrapper
+from handwriting_features.data.containers.strokes import HandwritingStrokes
+from handwriting_features.data.utils.math import derivation
+from handwriting_features.features.implementation.conventional.spatial import stroke_length, stroke_height, stroke_width
+from handwriting_features.features.implementation.conventional.temporal import stroke_duration
+from conftest import examples, variables
+
+
+@pytest.fixture(params=examples[:3], ids=lambda path: path.stem)
+def wrapper(request):
+    """Returns the sample wrapper of an example sample"""
+    return HandwritingSampleWrapper.from_svc(str(request.param), variables)
+
+
+def _sample_strokes(wrapper, in_air):
+    """Returns the on-surface/in-air strokes of the handwriting sample (the reference)"""
+    return [stroke for status, stroke in wrapper.sample.get_strokes() if (status == "in_air") == in_air]
+
+
+def test_strokes_equal_strokes_of_sample(wrapper):
+    expected = wrapper.sample.get_strokes()
+
+    assert len(wrapper.stroke_data) == len(expected)
+    for (status, stroke), (expected_status, expected_stroke) in zip(wrapper.stroke_data, expected):
+        assert status == expected_status
+        for channel in HandwritingStrokes.channels:
+            numpy.testing.assert_array_equal(getattr(stroke, channel), getattr(expected_stroke, channel))
+
+
+def test_strokes_are_views_into_channels(wrapper):
+    for _, stroke in wrapper.stroke_data:
+        for channel in HandwritingStrokes.channels:
+            assert numpy.shares_memory(getattr(stroke, channel), wrapper.stroke_data.data[channel])
+
+
+@pytest.mark.parametrize("in_air", [False, True])
+def test_gather_equals_concatenated_strokes(wrapper, in_air):
+    strokes = _sample_strokes(wrapper, in_air)
+    values, indices = wrapper.stroke_data.gather("x", in_air)
+
+    numpy.testing.assert_array_equal(values, numpy.concatenate([stroke.x for stroke in strokes]))
+    numpy.testing.assert_array_equal(indices, numpy.repeat(numpy.arange(len(strokes)), [s.x.size for s in strokes]))
+
+
+@pytest.mark.parametrize("in_air", [False, True])
+def test_reductions_equal_stroke_by_stroke_reductions(wrapper, in_air):
+    strokes = _sample_strokes(wrapper, in_air)
+    stroke_data = wrapper.stroke_data
+
+    numpy.testing.assert_array_equal(
+        stroke_data.reduce(numpy.maximum, stroke_data.data["y"], in_air), [numpy.max(s.y) for s in strokes])
+    numpy.testing.assert_array_equal(
+        stroke_data.reduce_increments(numpy.add, numpy.abs(derivation(stroke_data.data["x"])), in_air),
+        [numpy.sum(numpy.abs(derivation(s.x))) for s in strokes])
+
+
+@pytest.mark.parametrize("in_air", [False, True])
+def test_stroke_features_equal_stroke_by_stroke_features(wrapper, in_air):
+    strokes = _sample_strokes(wrapper, in_air)
+
+    # The lengths are summed in a different order (equal up to the floating-point tolerance)
+    numpy.testing.assert_allclose(
+        stroke_length(wrapper, in_air),
+        [sum(numpy.sqrt(derivation(s.x) ** 2 + derivation(s.y) ** 2)) for s in strokes], rtol=1e-12)
+    numpy.testing.assert_array_equal(stroke_height(wrapper, in_air), [max(s.y) - min(s.y) for s in strokes])
+    numpy.testing.assert_array_equal(stroke_width(wrapper, in_air), [max(s.x) - min(s.x) for s in strokes])
+    numpy.testing.assert_array_equal(stroke_duration(wrapper, in_air), [max(s.time) - min(s.time) for s in strokes])
+
+
+def test_derive_replaces_channels_and_shares_the_others(wrapper):
+    x = wrapper.stroke_data.data["x"] * 2.0
+    derived = wrapper.stroke_data.derive(x=x)
+
+    assert derived.data["x"] is not wrapper.stroke_data.data["x"]
+    assert derived.data["y"] is wrapper.stroke_data.data["y"]
+    assert derived.offsets is wrapper.stroke_data.offsets
+    for (_, stroke), (_, derived_stroke) in zip(wrapper.stroke_data, derived):
+        numpy.testing.assert_array_equal(derived_stroke.x, stroke.x * 2.0)
+        numpy.testing.assert_array_equal(derived_stroke.y, stroke.y)
@@ -0,0 +1,24 @@
+import pytest
+from handwriting_features.features.exceptions.validation import FeatureArgumentMissingError
+from handwriting_features.features.exceptions.validation import FeatureArgumentInvalidTypeError
+from handwriting_features.features.validation import HandwritingFeaturesFusion, HandwritingFeaturesValidation
+
+
+def test_explicit_argument_is_not_overridden_by_common_configuration():
+    fused = HandwritingFeaturesFusion.fuze("vertical_peaks_indices", {"fs": None}, {"fs": 133})
+    assert fused["fs"] is None
+
+
+def test_explicit_none_for_mandatory_argument_raises():
+    with pytest.raises(FeatureArgumentInvalidTypeError):
+        HandwritingFeaturesValidation.validate("vertical_peaks_indices", {"fs": None})
+
+
+def test_missing_mandatory_argument_raises():
+    with pytest.raises(FeatureArgumentMissingError):
+        HandwritingFeaturesValidation.validate("vertical_peaks_indices", {})
+
+
+def test_block_size_is_filled_by_common_configuration():
+    fused = HandwritingFeaturesFusion.fuze("number_of_inter_stroke_intersections", {}, {"block_size": 8})
+    assert HandwritingFeaturesValidation.validate("number_of_inter_stroke_intersections", fused) == {"block_size": 8}
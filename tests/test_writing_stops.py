@@ -0,0 +1,84 @@
+import numpy
+import pytest
+from handwriting_features.features import HandwritingFeatures
+from handwriting_features.data.utils.math import derivation
+from conftest import examples, variables
+
+
+def _get_borders(array):
+    """Gets borders of the runs of zeros of an array (the stroke-by-stroke reference)"""
+    border_l = numpy.where((array[1:] == 0) & (array[:-1] != 0))[0]
+    border_r = numpy.where((array[1:] != 0) & (array[:-1] == 0))[0]
+    if array[0] == 0:
+        border_l = numpy.array([0] + border_l.tolist())
+    if array[-1] == 0:
+        border_r = numpy.array(border_r.tolist() + [len(array)])
+    return border_l, border_r
+
+
+def _fuze_pauses(border_left, border_right, num_samples):
+    """Fuzes the pauses of a stroke (the stroke-by-stroke reference)"""
+    if len(border_left) < 2:
+        return border_left, border_right
+
+    # Mark the fuzed borders
+    for i in range(len(border_left) - 1):
+        if border_left[i + 1] - border_right[i] < (2 * num_samples):
+            border_left[i + 1], border_right[i] = numpy.nan, numpy.nan
+
+    # Remove the improper pauses
+    to_remove = [i for i, (l, r) in enumerate(zip(border_left, border_right)) if numpy.isnan(l) and numpy.isnan(r)]
+    border_left, border_right = numpy.delete(border_left, to_remove), numpy.delete(border_right, to_remove)
+
+    # Update the pauses
+    nans_right = numpy.isnan(border_right)
+    if nans_right.any():
+        border_right = numpy.array([
+            border_right[i + 1] if nan else border_right[i] for i, nan in enumerate(nans_right)
+        ])
+        border_left = numpy.delete(border_left, numpy.where(nans_right)[0] + 1)
+        border_right = numpy.delete(border_right, numpy.where(nans_right)[0] + 1)
+    return border_left, border_right
+
+
+def _writing_stops(wrapper):
+    """Computes the writing stops stroke by stroke (the reference)"""
+    time, lefts, rights = numpy.nan, [], []
+
+    for stroke in wrapper.on_surface_strokes:
+        length = numpy.sqrt(derivation(stroke.x) ** 2 + derivation(stroke.y) ** 2)
+        time = derivation(stroke.time)
+        velocity = numpy.array([0 if v <= 1 else v for v in length / time])
+        num_samples = numpy.ceil(0.015 / numpy.mean(time))
+
+        # Take only the pauses lasting at least 15 ms and fuze them
+        border_left, border_right = _get_borders(velocity)
+        pauses = numpy.where((border_right - border_left) > num_samples)[0]
+        border_left, border_right = _fuze_pauses(
+            border_left[pauses].astype(float), border_right[pauses].astype(float), num_samples)
+
+        lefts += border_left.tolist()
+        rights += (border_right - 1).tolist()
+
+    return (numpy.array(rights) - numpy.array(lefts)) * numpy.mean(time)
+
+
+def _with_stops(example, seed):
+    """Returns the handwriting features of an example sample with injected stops (repeated positions)"""
+    sample = HandwritingFeatures.from_svc(str(example), variables).wrapper.sample
+    data = numpy.vstack([getattr(sample, variable) for variable in variables]).T.astype(float)
+
+    # Inject the stops (hold the position of the pen)
+    rng = numpy.random.default_rng(seed)
+    for _ in range(rng.integers(5, 60)):
+        i, k = rng.integers(0, len(data)), rng.integers(1, 12)
+        data[i:i + k, :2] = data[i, :2]
+
+    return HandwritingFeatures.from_numpy_array(data, variables, fs=133)
+
+
+@pytest.mark.parametrize("example", examples[:6], ids=lambda path: path.stem)
+@pytest.mark.parametrize("seed", range(3))
+def test_writing_stops_equal_stroke_by_stroke_writing_stops(example, seed):
+    features = _with_stops(example, seed)
+    numpy.testing.assert_allclose(features.writing_stops(), _writing_stops(features.wrapper), rtol=1e-12)